@@ -2,12 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import Annotated
 from pydantic import BaseModel
 from auth import get_current_user
-from linkedin_supabase_service import SupabaseService
+from linkedin_supabase_service import linkedin_supabase_service
 
 router = APIRouter(prefix="/api/hooks", tags=["hooks"])
 
-linkedin_supabase_service = SupabaseService()
-
 # Pydantic models
 class BookmarkHookRequest(BaseModel):
     hook: str
@@ -43,17 +41,13 @@ async def get_user_hooks(
                 detail="Offset must be non-negative"
             )
         
-        # Get hooks and total count
-        hooks_data = await linkedin_supabase_service.get_user_hooks(
+        # Get hooks and total count in a single round-trip
+        hooks_data, total_count = await linkedin_supabase_service.get_user_hooks(
             user_id=current_user["id"],
             limit=limit,
             offset=offset
         )
         
-        total_count = await linkedin_supabase_service.get_hooks_count(
-            user_id=current_user["id"]
-        )
-        
         return {
             "success": True,
             "data": hooks_data,
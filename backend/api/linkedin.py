@@ -1,47 +1,70 @@
 from fastapi import APIRouter, HTTPException, Depends, Form, File, UploadFile
 from pydantic import BaseModel
 import os
-import base64
-import json
+import secrets
+import jwt
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from typing import Optional, Annotated
-from linkedin_supabase_service import SupabaseService
+from linkedin_supabase_service import linkedin_supabase_service
 from linkedin_oauth import LinkedInOAuth
-from linkedin_service import LinkedInService
-from auth import get_current_user
+from linkedin_service import LinkedInService, upload_size
+from auth import get_current_user, JWT_SECRET_KEY, JWT_ALGORITHM
 
 load_dotenv()
 
 router = APIRouter(prefix="/api/linkedin", tags=["linkedin"])
 
-# Initialize LinkedIn Supabase service
-linkedin_supabase_service = SupabaseService()
+# OAuth helper is stateless per request, so share one instance
+linkedin_oauth = LinkedInOAuth()
+
+# Maximum accepted image upload size (10MB)
+MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024
+
+# OAuth state is a short-lived signed token carrying the user ID
+OAUTH_STATE_TOKEN_TYPE = "linkedin_oauth_state"
+OAUTH_STATE_EXPIRE_MINUTES = 10
 
 # Pydantic models
 class LinkedInCallbackRequest(BaseModel):
     code: str
     state: Optional[str] = None
 
+def _decode_state(state: str) -> Optional[str]:
+    """
+    Verify the signed OAuth state and return the user ID it carries, or None if invalid
+    """
+    try:
+        state_data = jwt.decode(state, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except jwt.InvalidTokenError as e:
+        print(f"Error decoding state parameter: {e}")
+        return None
+    if state_data.get("type") != OAUTH_STATE_TOKEN_TYPE:
+        return None
+    return state_data.get("sub")
+
 # LinkedIn OAuth endpoints
 @router.get("/auth")
-def linkedin_auth(current_user: Annotated[dict, Depends(get_current_user)]):
+async def linkedin_auth(current_user: Annotated[dict, Depends(get_current_user)]):
     """
     Generate LinkedIn OAuth URL for user to authenticate
     """
-    oauth = LinkedInOAuth()
-    # Include user ID in the state parameter
-    auth_data = oauth.get_auth_url()
-    # Encode user ID in state parameter
-    user_id = current_user["id"]
-    state_data = {
-        "state": auth_data["state"],
-        "user_id": user_id
-    }
-    encoded_state = base64.b64encode(json.dumps(state_data).encode()).decode()
+    # Sign the user ID into the state parameter so the callback can trust it
+    encoded_state = jwt.encode(
+        {
+            "sub": current_user["id"],
+            "nonce": secrets.token_urlsafe(16),
+            "type": OAUTH_STATE_TOKEN_TYPE,
+            "exp": datetime.utcnow() + timedelta(minutes=OAUTH_STATE_EXPIRE_MINUTES),
+        },
+        JWT_SECRET_KEY,
+        algorithm=JWT_ALGORITHM,
+    )
+    auth_data = linkedin_oauth.get_auth_url(state=encoded_state)
     
     return {
-        "auth_url": auth_data["auth_url"].replace(auth_data["state"], encoded_state),
-        "state": encoded_state
+        "auth_url": auth_data["auth_url"],
+        "state": auth_data["state"]
     }
 
 @router.post("/callback")
@@ -50,25 +73,17 @@ async def linkedin_callback(request: LinkedInCallbackRequest):
     Handle LinkedIn OAuth callback and exchange code for access token
     """
     try:
-        oauth = LinkedInOAuth()
         code = request.code
         state = request.state
         
-        # Extract user ID from state parameter
-        user_id = None
-        if state:
-            try:
-                decoded_state = base64.b64decode(state.encode()).decode()
-                state_data = json.loads(decoded_state)
-                user_id = state_data.get("user_id")
-            except Exception as e:
-                print(f"Error decoding state parameter: {e}")
+        # Extract user ID from the signed state parameter
+        user_id = _decode_state(state) if state else None
         
         if not user_id:
             raise HTTPException(status_code=400, detail="Invalid state parameter - user ID not found")
         
         # Exchange code for token
-        token_data = await oauth.exchange_code_for_token(code)
+        token_data = await linkedin_oauth.exchange_code_for_token(code)
         access_token = token_data.get("access_token")
         refresh_token = token_data.get("refresh_token")
         
@@ -76,7 +91,7 @@ async def linkedin_callback(request: LinkedInCallbackRequest):
             raise HTTPException(status_code=500, detail="Failed to obtain access token from LinkedIn")
         
         # Get user profile
-        profile_data = await oauth.get_user_profile(access_token)
+        profile_data = await linkedin_oauth.get_user_profile(access_token)
         
         # Store token in Supabase using the authenticated user's ID
         storage_success = await linkedin_supabase_service.store_linkedin_token(
@@ -126,14 +141,9 @@ async def post_to_linkedin(
         if image.content_type not in allowed_types:
             raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}")
         
-        # Check file size (max 10MB) - read file to check size
-        # Note: We need to read it anyway for upload, so this is acceptable
-        file_content = await image.read()
-        if len(file_content) > 10 * 1024 * 1024:
+        # Check file size (max 10MB) without reading the upload into memory
+        if upload_size(image) > MAX_IMAGE_SIZE_BYTES:
             raise HTTPException(status_code=400, detail="Image file size exceeds 10MB limit")
-        
-        # Reset file pointer for later use
-        await image.seek(0)
     
     try:
         # Get the authenticated user's LinkedIn token
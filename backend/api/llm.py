@@ -1,25 +1,137 @@
 """
-LLM-backed generation API (first-post, generate-posts).
+LLM-backed generation API (first-post, first-post-for-user, generate-posts).
 Provider-agnostic route surface; implementation may use any model provider.
 """
+import asyncio
+from functools import lru_cache
+
 from fastapi import APIRouter, Request, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import anthropic
+import orjson
 import os
 from dotenv import load_dotenv
-from typing import Annotated, Optional
+from typing import Annotated, Any, AsyncIterator, Dict, Optional
 from auth import get_current_user
-from linkedin_supabase_service import SupabaseService
+from linkedin_supabase_service import linkedin_supabase_service
+from api.onboarding import get_onboarding_row
 from utils.rate_limit import llm_rate_limiter, get_client_ip
+from utils.anthropic_client import anthropic_client as client
 
 load_dotenv()
 
 router = APIRouter(prefix="/api/llm", tags=["llm"])
 
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+# Bound on in-flight LLM calls across all requests handled by this worker.
+# Size it to the Anthropic account tier so bursts queue here instead of
+# coming back as 429s.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "30"))
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+FIRST_POST_SYSTEM_PROMPT = (
+    "You are an expert LinkedIn ghostwriter. "
+    "Write engaging, professional posts that feel authentic to the person."
+)
+
+# Filled per request by _build_first_post_prompt
+FIRST_POST_PROMPT_TEMPLATE = """Generate a first-person LinkedIn post for the following user:
+Full Name: {full_name}
+Role: {role}
+Company: {company}
+Core Mission: {core_mission}
+Target Audience: {target_audience}
+Specific Topics: {specific_topics}
+Selected Goals: {selected_goals}
+Selected Hooks: {selected_hooks}
+
+Post Requirements:
+- Tone: warm, confident, and credible (no cringe, no buzzword soup).
+- Keep it within normal LinkedIn length (150–250 words is fine).
+- Use short paragraphs, no emoji nor em-dashes.
+- Do NOT include hashtags or mentions.
+"""
+
+# Styles cycled across posts so each generated post takes a different approach
+POST_STYLES = [
+    "storytelling",
+    "tips/advice",
+    "thought leadership",
+    "engagement question",
+    "case study",
+    "personal anecdote",
+]
+
+# Angles for the second and later posts in the same style (more than
+# len(POST_STYLES) posts requested), so repeats differ by more than sampling.
+# MAX_POSTS_PER_REQUEST / len(POST_STYLES) rounds up to 4 posts per style.
+POST_VARIANT_ANGLES = [
+    "a contrarian take that challenges common advice",
+    "a lesson learned from a mistake or setback",
+    "a concrete, step-by-step how-to",
+]
+
+# Per-post token budget by length (1=short, 2=medium, 3=long)
+POST_MAX_TOKENS = {1: 400, 2: 700, 3: 1000}
+
+# Target word count by length, as phrased in the prompt
+POST_TARGET_WORDS = {1: "about 150", 2: "about 300", 3: "about 500"}
+
+# Matches the per-generation limit enforced when storing hooks
+MAX_POSTS_PER_REQUEST = 20
+
+# Maximum concurrent LLM calls made for a single generate-posts request
+POST_GENERATION_CONCURRENCY = 10
+
+
+def require_llm_client() -> anthropic.AsyncAnthropic:
+    """
+    FastAPI dependency returning the LLM client, or 503 if it isn't configured.
+    """
+    if client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM API key not configured. Please set ANTHROPIC_API_KEY in your .env file"
+        )
+    return client
+
 
-# Initialize LinkedIn Supabase service for storing generated hooks
-linkedin_supabase_service = SupabaseService()
+@lru_cache(maxsize=512)
+def _build_post_system_prompt(
+    style: str,
+    length: int,
+    context: Optional[str],
+    tone: Optional[str],
+    audience: Optional[str],
+) -> str:
+    """
+    Build the generate-posts system prompt for one style.
+
+    Cached because most requests use the default parameters, so the same few
+    prompts are assembled over and over.
+    """
+    target_words = POST_TARGET_WORDS[length]
+
+    if context:
+        context_part = f"\n\nUser Context: {context}\nMake the post specific and relevant to this context."
+    else:
+        context_part = "\n\nUser Context: Not provided. Create a generic but engaging startup-focused post that would work for any founder/entrepreneur."
+
+    tone_part = f"\nTone: {tone}" if tone else ""
+    audience_part = f"\nTarget Audience: {audience}" if audience else ""
+
+    return f"""You are an expert LinkedIn content creator specializing in helping startups and entrepreneurs gain traction.
+
+Your task is to write ONE LinkedIn post in a {style} style. The post should be approximately {target_words} words.{context_part}{tone_part}{audience_part}
+
+Requirements:
+1. The post should be engaging and designed to get traction for startup founders/entrepreneurs
+2. Include relevant hashtags at the end of the post (3-5 hashtags)
+3. Make the post actionable and valuable
+4. The post should encourage engagement (comments, shares, reactions)
+
+CRITICAL: Start immediately with the post content - do NOT prefix the post with numbers, titles / headings, or labels.
+"""
 
 
 class FirstPostRequest(BaseModel):
@@ -37,6 +149,31 @@ class FirstPostResponse(BaseModel):
     post_text: str
 
 
+def _build_first_post_prompt(request: FirstPostRequest) -> str:
+    return FIRST_POST_PROMPT_TEMPLATE.format(
+        full_name=request.full_name,
+        role=request.role,
+        company=request.company,
+        core_mission=request.core_mission,
+        target_audience=request.target_audience,
+        specific_topics=request.specific_topics,
+        selected_goals=", ".join(request.selected_goals),
+        selected_hooks=", ".join(request.selected_hooks),
+    )
+
+
+def _first_post_message_params(request: FirstPostRequest) -> Dict[str, Any]:
+    """messages.create / messages.stream arguments shared by both first-post routes."""
+    return {
+        "model": "claude-haiku-4-5",
+        "max_tokens": 800,
+        "system": FIRST_POST_SYSTEM_PROMPT,
+        "messages": [
+            {"role": "user", "content": _build_first_post_prompt(request)}
+        ],
+    }
+
+
 class LinkedInPostGenerationRequest(BaseModel):
     quantity: int = 10
     context: Optional[str] = None
@@ -45,10 +182,25 @@ class LinkedInPostGenerationRequest(BaseModel):
     audience: Optional[str] = None  # Optional: more specific audience targeting
 
 
+async def _generate_first_post(
+    request: FirstPostRequest, llm_client: anthropic.AsyncAnthropic
+) -> FirstPostResponse:
+    async with llm_semaphore:
+        response = await llm_client.messages.create(**_first_post_message_params(request))
+    post_text = response.content[0].text
+    if not post_text:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate post content"
+        )
+    return FirstPostResponse(post_text=post_text)
+
+
 @router.post("/first-post", response_model=FirstPostResponse)
 async def generate_first_post(
     request: FirstPostRequest,
-    http_request: Request
+    http_request: Request,
+    llm_client: Annotated[anthropic.AsyncAnthropic, Depends(require_llm_client)]
 ):
     # Rate limiting check
     client_ip = get_client_ip(http_request)
@@ -57,56 +209,93 @@ async def generate_first_post(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded. Please try again later."
         )
-    system_prompt = (
-        "You are an expert LinkedIn ghostwriter. "
-        "Write engaging, professional posts that feel authentic to the person."
-    )
-    user_prompt = (
-        f"""
-        Generate a first-person LinkedIn post for the following user:
-        Full Name: {request.full_name}
-        Role: {request.role}
-        Company: {request.company}
-        Core Mission: {request.core_mission}
-        Target Audience: {request.target_audience}
-        Specific Topics: {request.specific_topics}
-        Selected Goals: {", ".join(request.selected_goals)}
-        Selected Hooks: {", ".join(request.selected_hooks)}
-
-        Post Requirements:
-        - Tone: warm, confident, and credible (no cringe, no buzzword soup).
-        - Keep it within normal LinkedIn length (150–250 words is fine).
-        - Use short paragraphs, no emoji nor em-dashes.
-        - Do NOT include hashtags or mentions.
-        """
-    )
-    response = client.messages.create(
-        model="claude-haiku-4-5",
-        max_tokens=800,
-        system=system_prompt,
-        messages=[
-            {"role": "user", "content": user_prompt}
-        ],
+    return await _generate_first_post(request, llm_client)
+
+
+@router.post("/first-post-for-user", response_model=FirstPostResponse)
+async def generate_first_post_for_user(
+    current_user: Annotated[dict, Depends(get_current_user)],
+    http_request: Request,
+    llm_client: Annotated[anthropic.AsyncAnthropic, Depends(require_llm_client)]
+):
+    """
+    Generate the current user's first post from their saved onboarding data,
+    so clients don't have to fetch it and post it back to /first-post.
+    """
+    # Rate limiting check
+    client_ip = get_client_ip(http_request)
+    if not llm_rate_limiter.check_rate_limit(client_ip):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Please try again later."
+        )
+    row = await get_onboarding_row(current_user["id"])
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No onboarding data found. Complete onboarding first."
+        )
+    request = FirstPostRequest(
+        full_name=row.get("name") or "",
+        role=row.get("role") or "",
+        company=row.get("company") or "",
+        core_mission=row.get("company_mission") or "",
+        target_audience=row.get("target_audience") or "",
+        specific_topics=row.get("topics_to_post") or "",
+        selected_goals=row.get("selected_goals") or [],
+        selected_hooks=row.get("selected_hooks") or [],
     )
-    post_text = response.content[0].text
-    if not post_text:
+    return await _generate_first_post(request, llm_client)
+
+
+@router.post("/first-post/stream")
+async def stream_first_post(
+    request: FirstPostRequest,
+    http_request: Request,
+    llm_client: Annotated[anthropic.AsyncAnthropic, Depends(require_llm_client)]
+):
+    """
+    Same as /first-post, but streams the post as server-sent events while it
+    is generated instead of waiting for the whole completion.
+
+    Each "data:" event carries {"text": "<next chunk>"}. The stream ends with
+    an "event: done" event, or "event: error" with {"detail": ...} if
+    generation fails part way.
+    """
+    # Rate limiting check
+    client_ip = get_client_ip(http_request)
+    if not llm_rate_limiter.check_rate_limit(client_ip):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate post content"
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Please try again later."
         )
-    return FirstPostResponse(post_text=post_text)
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async with llm_semaphore:
+                async with llm_client.messages.stream(**_first_post_message_params(request)) as stream:
+                    async for text in stream.text_stream:
+                        yield b"data: " + orjson.dumps({"text": text}) + b"\n\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield b"event: error\ndata: " + orjson.dumps({"detail": f"Failed to generate post content: {str(e)}"}) + b"\n\n"
+            return
+        yield b"event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @router.post("/generate-posts")
 async def generate_linkedin_posts(
     request: LinkedInPostGenerationRequest,
-    current_user: Annotated[dict, Depends(get_current_user)]
+    current_user: Annotated[dict, Depends(get_current_user)],
+    llm_client: Annotated[anthropic.AsyncAnthropic, Depends(require_llm_client)]
 ):
     """
     Generate multiple LinkedIn post hooks/content using the configured LLM.
 
     Parameters:
-    - quantity: Number of posts to generate (default: 10, minimum: 3)
+    - quantity: Number of posts to generate (default: 10, minimum: 3, maximum: 20)
     - context: Optional user context to personalize posts (default: null for generic posts)
     - length: Post length - 1=short (~150 words), 2=medium (~300 words), 3=long (~500 words) (default: 2)
     - tone: Optional tone (professional, casual, friendly, etc.)
@@ -114,18 +303,11 @@ async def generate_linkedin_posts(
 
     Returns a list of unique LinkedIn post suggestions in different styles.
     """
-    # Validate LLM API key
-    if not client:
-        raise HTTPException(
-            status_code=500,
-            detail="LLM API key not configured. Please set ANTHROPIC_API_KEY in your .env file"
-        )
-
     # Validate quantity
-    if request.quantity < 3:
+    if request.quantity < 3 or request.quantity > MAX_POSTS_PER_REQUEST:
         raise HTTPException(
             status_code=400,
-            detail="Quantity must be at least 3"
+            detail=f"Quantity must be between 3 and {MAX_POSTS_PER_REQUEST}"
         )
 
     # Validate length
@@ -135,71 +317,65 @@ async def generate_linkedin_posts(
             detail="Length must be 1 (short), 2 (medium), or 3 (long)"
         )
 
-    # Determine word count based on length
-    word_counts = {1: "about 150", 2: "about 300", 3: "about 500"}
-    target_words = word_counts[request.length]
-
-    # Build the prompt
-    context_part = ""
-    if request.context:
-        context_part = f"\n\nUser Context: {request.context}\nMake the posts specific and relevant to this context."
-    else:
-        context_part = "\n\nUser Context: Not provided. Create generic but engaging startup-focused posts that would work for any founder/entrepreneur."
-
-    tone_part = ""
-    if request.tone:
-        tone_part = f"\nTone: {request.tone}"
-
-    audience_part = ""
-    if request.audience:
-        audience_part = f"\nTarget Audience: {request.audience}"
-
-    system_prompt = f"""You are an expert LinkedIn content creator specializing in helping startups and entrepreneurs gain traction.
-
-Your task is to generate {request.quantity} unique LinkedIn posts, each with a DIFFERENT style and approach. Each post should be approximately {target_words} words.{context_part}{tone_part}{audience_part}
+    # One small call per post, each in a different style, run concurrently
+    semaphore = asyncio.Semaphore(POST_GENERATION_CONCURRENCY)
+
+    def post_instruction(style: str, variant: int) -> str:
+        if variant == 0:
+            return f"Write one {style} LinkedIn post."
+        angle = POST_VARIANT_ANGLES[(variant - 1) % len(POST_VARIANT_ANGLES)]
+        return (
+            f"Write one {style} LinkedIn post. This is variant {variant + 1} of the "
+            f"{style} posts in this batch: build it around {angle}, with a different "
+            "topic and opening line than the obvious one, so it stands alone from "
+            "the other posts."
+        )
 
-Requirements:
-1. Each post must be UNIQUE in style - use different formats like: storytelling, tips/advice, thought leadership, engagement questions, case studies, personal anecdotes, etc.
-2. Posts should be engaging and designed to get traction for startup founders/entrepreneurs
-3. Include relevant hashtags at the end of each post (3-5 hashtags)
-4. Make posts actionable and valuable
-5. Each post should stand alone and not reference the others
-6. Posts should encourage engagement (comments, shares, reactions)
-
-CRITICAL: Each post must start immediately with the post content - do NOT prefix posts with numbers (like "1." or "Post 1:"), titles / headings, or labels. Separate posts with blank lines.
-"""
+    async def generate_post(index: int) -> str:
+        # Styles cycle, so the variant is how many times this style has come up
+        style = POST_STYLES[index % len(POST_STYLES)]
+        instruction = post_instruction(style, index // len(POST_STYLES))
+        system_prompt = _build_post_system_prompt(
+            style, request.length, request.context, request.tone, request.audience
+        )
+        async with semaphore, llm_semaphore:
+            response = await llm_client.messages.create(
+                model="claude-haiku-4-5",
+                max_tokens=POST_MAX_TOKENS[request.length],
+                temperature=0.9,  # Higher temperature for more creative and varied outputs
+                system=system_prompt,
+                messages=[
+                    {"role": "user", "content": instruction}
+                ],
+            )
+        # Safely extract content with null safety
+        return response.content[0].text.strip() if response.content and len(response.content) > 0 else ""
 
     try:
-        response = client.messages.create(
-            model="claude-haiku-4-5",
-            max_tokens=4000 if request.length == 3 else 2500 if request.length == 2 else 1500,
-            temperature=0.9,  # Higher temperature for more creative and varied outputs
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": f"Generate {request.quantity} unique LinkedIn posts with different styles."}
-            ],
+        results = await asyncio.gather(
+            *(generate_post(index) for index in range(request.quantity)),
+            return_exceptions=True,
         )
 
-        # Safely extract content with null safety
-        posts_text = response.content[0].text if response.content and len(response.content) > 0 else ""
+        # Keep the posts that came back; a single failed call shouldn't sink the batch
+        failures = [result for result in results if isinstance(result, BaseException)]
+        for failure in failures:
+            print(f"Warning: Post generation call failed: {failure!r}")
 
-        if not posts_text:
+        cleaned_posts = [
+            post for post in results
+            if isinstance(post, str) and len(post) > 10
+        ]
+
+        if not cleaned_posts:
+            # Surface the real cause (bad key, rate limit, timeout) when every call failed
+            if failures:
+                raise failures[0]
             raise HTTPException(
                 status_code=500,
                 detail="LLM returned empty response. Please try again."
             )
 
-        # Parse the posts (split by blank lines)
-        posts_list = [p.strip() for p in posts_text.split('\n\n') if p.strip()]
-
-        # Simple cleanup - just remove leading prefixes like "1.", "Post 1:", etc.
-        cleaned_posts = []
-        for post in posts_list:
-            if post.strip():
-                post = post.strip()
-                if post and len(post) > 10:
-                    cleaned_posts.append(post)
-
         # Store hooks in database
         stored_record = None
         storage_error = None
@@ -216,6 +392,7 @@ CRITICAL: Each post must start immediately with the post content - do NOT prefix
         response = {
             "success": True,
             "quantity": len(cleaned_posts),
+            "failed": request.quantity - len(cleaned_posts),
             "posts": cleaned_posts,
             "parameters": {
                 "quantity": request.quantity,
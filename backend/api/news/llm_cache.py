@@ -0,0 +1,49 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+
+
+class LLMCache:
+    """
+    In-process exact-match cache for LLM completion text.
+
+    Entries are keyed by a SHA-256 of the canonicalized request (model,
+    system prompt, messages and sampling settings), so an identical prompt
+    reuses the earlier completion until it expires. The oldest entries are
+    evicted once max_entries is reached.
+    """
+
+    def __init__(self, ttl_seconds: int = 24 * 3600, max_entries: int = 512) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # key -> (expiry on the monotonic clock, completion text)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(**request: Any) -> str:
+        return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+# Used by the news summary calls only. Hook generation is sampled for fresh
+# content and deliberately bypasses it.
+llm_cache = LLMCache()
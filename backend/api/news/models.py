@@ -1,18 +1,22 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict
 
 
 class Article(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str
     description: Optional[str] = None
     url: str
-    published_at: Optional[str] = Field(default=None, alias="publishedAt")
+    published_at: Optional[str] = None
     source: Optional[str] = None
 
 
 class IndustryNewsResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     industry: str
     slug: str
     provider: str
@@ -21,11 +25,15 @@ class IndustryNewsResponse(BaseModel):
 
 
 class BulkIndustryNewsResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     results: List[IndustryNewsResponse]
     errors: List[Dict[str, Any]]
 
 
 class IndustryInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     slug: str
     industry: str
     provider: str
@@ -44,9 +52,22 @@ class IndustryAPIConfig:
     industry: str
     provider: str
     endpoint: str
-    params_builder: Callable[[Optional[str]], Dict[str, Any]]
+    # Static query params; the API key, if any, is added under api_key_param
+    params: Dict[str, Any]
     parser: Callable[[Dict[str, Any]], List[Dict[str, Any]]]
     requires_api_key: bool = True
     api_key_env: Optional[str] = None
+    api_key_param: Optional[str] = None
     timeout: float = 10.0
+    # Error details fixed by the config, built once instead of on every failure
+    missing_key_detail: str = field(init=False, repr=False)
+    incomplete_config_detail: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.missing_key_detail = (
+            f"{self.provider} API key missing. Set {self.api_key_env} to enable {self.industry} coverage."
+        )
+        self.incomplete_config_detail = (
+            f"{self.provider} configuration incomplete. Please set {self.api_key_env}."
+        )
 
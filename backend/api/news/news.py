@@ -1,16 +1,16 @@
 import asyncio
-import json
-import os
-import re
-from typing import Annotated, Any, Awaitable, Dict, List, Optional
+import logging
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, status
-import anthropic
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response, status
+import orjson
 from pydantic import BaseModel
 
 from utils.rate_limit import news_rate_limiter, get_client_ip
 from utils.simple_auth import verify_api_token
-from linkedin_supabase_service import SupabaseService
+from utils.http_client import news_http_client
+from utils.anthropic_client import anthropic_client
+from linkedin_supabase_service import linkedin_supabase_service
 from auth import get_current_user
 
 from .models import (
@@ -22,6 +22,7 @@ from .models import (
     MissingAPIKey,
 )
 from .parsers import (
+    _extract_json_object,
     _parse_alphavantage,
     _parse_gdelt,
     _parse_gnews,
@@ -34,6 +35,8 @@ from .summary_builder import NewsSummaryBuilder
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
+logger = logging.getLogger(__name__)
+
 
 INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
     IndustryAPIConfig(
@@ -42,12 +45,12 @@ INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
         provider="GNews",
         endpoint="https://gnews.io/api/v4/top-headlines",
         api_key_env="GNEWS_API_KEY",
-        params_builder=lambda api_key: {
+        params={
             "topic": "technology",
             "lang": "en",
             "max": 10,
-            "apikey": api_key,
         },
+        api_key_param="apikey",
         parser=_parse_gnews,
     ),
     IndustryAPIConfig(
@@ -56,13 +59,13 @@ INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
         provider="Alpha Vantage",
         endpoint="https://www.alphavantage.co/query",
         api_key_env="ALPHAVANTAGE_API_KEY",
-        params_builder=lambda api_key: {
+        params={
             "function": "NEWS_SENTIMENT",
             "topics": "financial_markets",
             "sort": "LATEST",
             "limit": 10,
-            "apikey": api_key,
         },
+        api_key_param="apikey",
         parser=_parse_alphavantage,
     ),
     IndustryAPIConfig(
@@ -71,11 +74,11 @@ INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
         provider="NewsData.io",
         endpoint="https://newsdata.io/api/1/news",
         api_key_env="NEWSDATA_API_KEY",
-        params_builder=lambda api_key: {
+        params={
             "category": "health",
             "language": "en",
-            "apikey": api_key,
         },
+        api_key_param="apikey",
         parser=_parse_newsdata,
     ),
     IndustryAPIConfig(
@@ -84,7 +87,7 @@ INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
         provider="GDELT Project",
         endpoint="https://api.gdeltproject.org/api/v2/doc/doc",
         requires_api_key=False,
-        params_builder=lambda _api_key: {
+        params={
             "query": "energy OR renewable energy OR oil market",
             "mode": "ArtList",
             "maxrecords": 10,
@@ -99,14 +102,14 @@ INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
         provider="The Guardian Open Platform",
         endpoint="https://content.guardianapis.com/search",
         api_key_env="GUARDIAN_API_KEY",
-        params_builder=lambda api_key: {
+        params={
             "section": "business",
             "tag": "business/retail",
             "order-by": "newest",
             "page-size": 10,
             "show-fields": "trailText,headline",
-            "api-key": api_key,
         },
+        api_key_param="api-key",
         parser=_parse_guardian,
     ),
     IndustryAPIConfig(
@@ -115,30 +118,20 @@ INDUSTRY_CONFIGS: List[IndustryAPIConfig] = [
         provider="NewsAPI.org",
         endpoint="https://newsapi.org/v2/everything",
         api_key_env="NEWSAPI_KEY",
-        params_builder=lambda api_key: {
+        params={
             "q": "transportation OR logistics OR electric vehicle OR autonomous driving",
             "language": "en",
             "sortBy": "publishedAt",
             "pageSize": 10,
-            "apiKey": api_key,
         },
+        api_key_param="apiKey",
         parser=_parse_newsapi,
     ),
 ]
 
 
 summary_builder = NewsSummaryBuilder()
-news_service = IndustryNewsService(INDUSTRY_CONFIGS, summary_builder)
-
-# Anthropic client for generating hooks
-anthropic_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY")) if os.getenv("ANTHROPIC_API_KEY") else None
-
-# Supabase service for storing news hooks
-try:
-    supabase_service = SupabaseService()
-except Exception as e:
-    print(f"Warning: Failed to initialize SupabaseService: {str(e)}")
-    supabase_service = None
+news_service = IndustryNewsService(INDUSTRY_CONFIGS, summary_builder, news_http_client)
 
 
 class IndustryHooksResponse(BaseModel):
@@ -153,6 +146,28 @@ class NewsHooksResponse(BaseModel):
     total_hooks: int
 
 
+HOOKS_SYSTEM_PROMPT = """You are an expert LinkedIn content creator specializing in creating engaging post hooks that grab attention and drive engagement.
+
+Your task is to generate unique LinkedIn post hooks based on news summaries. Each hook should:
+1. Be compelling and attention-grabbing
+2. Be suitable as the opening line of a LinkedIn post
+3. Be 1-2 sentences maximum
+4. Create curiosity or urgency
+5. Be professional but engaging
+6. Focus on generalizable business insights and industry trends
+7. Be applicable to any entrepreneur, founder, or business professional within this broad industry
+8. Avoid specific product names, company names, or overly specific details
+9. Emphasize strategic insights, market trends, and broader implications"""
+
+# Shared by the per-industry and bulk hook prompts
+HOOK_GUIDELINES = """- Extract the broader business insight or industry trend from the news
+- Be generalizable and applicable to any business professional
+- Focus on strategic implications rather than specific products or companies
+- Use patterns like "Here's what [trend] tells us about [broader insight]" or "The [industry] shift that matters for every business"
+- Make them diverse in style (questions, statements, insights, etc.)
+- Avoid mentioning specific brand names, product launches, or company-specific details unless they illustrate a larger trend"""
+
+
 async def generate_hooks_from_summary(summary: str, industry: str, num_hooks: int = 4) -> List[str]:
     """
     Generate LinkedIn post hooks from a news summary using Anthropic.
@@ -171,30 +186,12 @@ async def generate_hooks_from_summary(summary: str, industry: str, num_hooks: in
             detail="Anthropic API key not configured",
         )
 
-    system_prompt = """You are an expert LinkedIn content creator specializing in creating engaging post hooks that grab attention and drive engagement.
-
-Your task is to generate unique LinkedIn post hooks based on news summaries. Each hook should:
-1. Be compelling and attention-grabbing
-2. Be suitable as the opening line of a LinkedIn post
-3. Be 1-2 sentences maximum
-4. Create curiosity or urgency
-5. Be professional but engaging
-6. Focus on generalizable business insights and industry trends
-7. Be applicable to any entrepreneur, founder, or business professional within this broad industry
-8. Avoid specific product names, company names, or overly specific details
-9. Emphasize strategic insights, market trends, and broader implications"""
-
     user_prompt = f"""Generate {num_hooks} unique LinkedIn post hooks based on this {industry} news summary:
 
 {summary}
 
 Each hook should:
-- Extract the broader business insight or industry trend from the news
-- Be generalizable and applicable to any business professional
-- Focus on strategic implications rather than specific products or companies
-- Use patterns like "Here's what [trend] tells us about [broader insight]" or "The [industry] shift that matters for every business"
-- Make them diverse in style (questions, statements, insights, etc.)
-- Avoid mentioning specific brand names, product launches, or company-specific details unless they illustrate a larger trend
+{HOOK_GUIDELINES}
 
 IMPORTANT: Return your response as a JSON object with a "hooks" array containing exactly {num_hooks} hooks. Format:
 {{
@@ -205,16 +202,21 @@ IMPORTANT: Return your response as a JSON object with a "hooks" array containing
   ]
 }}"""
 
+    request = {
+        "model": "claude-haiku-4-5",
+        "max_tokens": 500,
+        "temperature": 0.8,
+        "system": HOOKS_SYSTEM_PROMPT,
+        "messages": [
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+
+    # Not served from llm_cache: hooks are sampled to produce fresh content
+    # that gets stored, so replaying an earlier completion would only insert
+    # duplicate news_hooks rows
     try:
-        response = anthropic_client.messages.create(
-            model="claude-haiku-4-5",
-            max_tokens=500,
-            temperature=0.8,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt},
-            ],
-        )
+        response = await anthropic_client.messages.create(**request)
 
         if not response.content or len(response.content) == 0:
             raise HTTPException(
@@ -233,13 +235,11 @@ IMPORTANT: Return your response as a JSON object with a "hooks" array containing
 
         # Parse the JSON response
         try:
-            # Try to extract JSON from the response (might be wrapped in markdown code blocks)
-            json_match = re.search(r'\{[^{}]*"hooks"[^{}]*\[[^\]]*\][^{}]*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(0)
+            # The JSON may be wrapped in prose or markdown code blocks
+            response_text = _extract_json_object(response_text)
             
-            function_args = json.loads(response_text)
-        except json.JSONDecodeError as e:
+            function_args = orjson.loads(response_text)
+        except orjson.JSONDecodeError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error parsing Anthropic response: {str(e)}. Response was: {response_text[:200]}",
@@ -264,7 +264,7 @@ IMPORTANT: Return your response as a JSON object with a "hooks" array containing
 
         return cleaned_hooks
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error parsing Anthropic response: {str(e)}",
@@ -276,8 +276,85 @@ IMPORTANT: Return your response as a JSON object with a "hooks" array containing
         )
 
 
+async def generate_hooks_bulk(
+    summaries: Dict[str, Tuple[str, str]], num_hooks: int = 4
+) -> Dict[str, List[str]]:
+    """
+    Generate hooks for several industries with a single Anthropic call.
+
+    Args:
+        summaries: Industry slug -> (industry name, news summary)
+        num_hooks: Number of hooks to generate per industry (default: 4)
+
+    Returns:
+        Industry slug -> hooks, for the industries whose hooks came back
+        complete. Callers fall back to generate_hooks_from_summary for the rest.
+    """
+    if not anthropic_client or not summaries:
+        return {}
+
+    sections = "\n\n".join(
+        f"[{slug}]\nIndustry: {industry}\nSummary: {summary}"
+        for slug, (industry, summary) in summaries.items()
+    )
+    user_prompt = f"""Generate {num_hooks} unique LinkedIn post hooks for each industry news summary below.
+
+Each hook should:
+{HOOK_GUIDELINES}
+
+IMPORTANT: Return your response as a JSON object with a "hooks" object mapping each bracketed slug to an array of exactly {num_hooks} hooks. Format:
+{{
+  "hooks": {{
+    "<slug>": ["Hook 1 text here", "Hook 2 text here", ...],
+    ...
+  }}
+}}
+
+{sections}"""
+
+    request = {
+        "model": "claude-haiku-4-5",
+        "max_tokens": 500 * len(summaries),
+        "temperature": 0.8,
+        "system": HOOKS_SYSTEM_PROMPT,
+        "messages": [
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+
+    # Like generate_hooks_from_summary, never replayed from llm_cache
+    try:
+        response = await anthropic_client.messages.create(**request)
+        response_text = (
+            response.content[0].text
+            if response.content and response.content[0].type == "text"
+            else ""
+        )
+        parsed = orjson.loads(_extract_json_object(response_text))
+    except Exception as e:
+        logger.warning(f"Bulk hook generation failed, falling back per industry: {e}")
+        return {}
+
+    # The model may answer in the single-industry shape ({"hooks": [...]}) or
+    # with a bare array; anything but a slug-keyed object falls back entirely
+    hooks_object = parsed.get("hooks") if isinstance(parsed, dict) else None
+    if not isinstance(hooks_object, dict):
+        logger.warning("Bulk hook reply was not keyed by slug, falling back per industry")
+        return {}
+
+    hooks_by_slug: Dict[str, List[str]] = {}
+    for slug, hooks in hooks_object.items():
+        if slug not in summaries or not isinstance(hooks, list):
+            continue
+        cleaned_hooks = [hook.strip() for hook in hooks if isinstance(hook, str) and hook.strip()]
+        if len(cleaned_hooks) == num_hooks:
+            hooks_by_slug[slug] = cleaned_hooks
+
+    return hooks_by_slug
+
+
 @router.get("/industries", response_model=List[IndustryInfo])
-async def list_industries(request: Request) -> List[IndustryInfo]:
+async def list_industries(request: Request) -> Response:
     # Rate limiting check
     client_ip = get_client_ip(request)
     if not news_rate_limiter.check_rate_limit(client_ip):
@@ -285,7 +362,7 @@ async def list_industries(request: Request) -> List[IndustryInfo]:
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded. Please try again later.",
         )
-    return news_service.list_industries()
+    return Response(content=news_service.list_industries_json(), media_type="application/json")
 
 
 @router.get("/", response_model=BulkIndustryNewsResponse)
@@ -305,11 +382,7 @@ async def fetch_multiple_industries(
             detail="Rate limit exceeded. Please try again later.",
         )
     slugs = news_service.resolve_slugs(industries)
-    tasks: List[Awaitable[IndustryNewsResponse]] = [
-        news_service.get_industry_news(slug, refresh_cache=refresh_cache)
-        for slug in slugs
-    ]
-    responses = await asyncio.gather(*tasks, return_exceptions=True)
+    responses = await news_service.get_many_industry_news(slugs, refresh_cache=refresh_cache)
 
     results: List[IndustryNewsResponse] = []
     errors: List[Dict[str, Any]] = []
@@ -361,14 +434,8 @@ async def get_news_hooks(
     - created_after: Optional ISO date string - only return hooks created after this date
     """
     try:
-        if not supabase_service:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Database service is not available",
-            )
-        
         # Fetch news hooks from database
-        hooks_data = await supabase_service.get_news_hooks(
+        hooks_data = await linkedin_supabase_service.get_news_hooks(
             industry_slug=industry_slug,
             created_after=created_after
         )
@@ -434,63 +501,69 @@ async def generate_news_hooks(
         
         # Fetch news from all industries
         slugs = news_service.resolve_slugs(None)
-        tasks: List[Awaitable[IndustryNewsResponse]] = [
-            news_service.get_industry_news(slug, refresh_cache=refresh_cache)
-            for slug in slugs
-        ]
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process each industry and generate hooks
-        industry_hooks: List[IndustryHooksResponse] = []
+        responses = await news_service.get_many_industry_news(slugs, refresh_cache=refresh_cache)
         
+        # Collect the industries that have a summary to generate hooks from
+        news_results: List[IndustryNewsResponse] = []
+
         for slug, result in zip(slugs, responses):
             if isinstance(result, HTTPException):
                 # Skip industries that failed
-                print(f"Skipping {slug}: HTTPException - {result.detail}")
+                logger.warning(f"Skipping {slug}: HTTPException - {result.detail}")
                 continue
             
             if not isinstance(result, IndustryNewsResponse):
                 # Skip other errors
-                print(f"Skipping {slug}: Unexpected error type - {type(result)}: {str(result)}")
+                logger.warning(f"Skipping {slug}: Unexpected error type - {type(result)}: {result}")
                 continue
-            
-            # Generate 4 hooks from the summary
-            try:
-                hooks = await generate_hooks_from_summary(
+
+            news_results.append(result)
+
+        # Generate 4 hooks per industry in one call, then retry concurrently
+        # for any industry the bulk reply didn't cover
+        hooks_by_slug = await generate_hooks_bulk(
+            {result.slug: (result.industry, result.summary) for result in news_results},
+            num_hooks=4,
+        )
+
+        missing = [result for result in news_results if result.slug not in hooks_by_slug]
+        fallback_hooks = await asyncio.gather(
+            *(
+                generate_hooks_from_summary(
                     summary=result.summary,
                     industry=result.industry,
                     num_hooks=4
                 )
-                
-                # Store in Supabase
-                if supabase_service:
-                    try:
-                        await supabase_service.store_news_hooks(
-                            industry=result.industry,
-                            industry_slug=result.slug,
-                            summary=result.summary,
-                            hooks=hooks
-                        )
-                    except Exception as e:
-                        # Log error but don't fail the request
-                        print(f"Warning: Failed to store news hooks for {result.industry} in database: {str(e)}")
-                else:
-                    print("Warning: SupabaseService not initialized, skipping database storage")
-                
-                industry_hooks.append(
-                    IndustryHooksResponse(
-                        industry=result.industry,
-                        slug=result.slug,
-                        summary=result.summary,
-                        hooks=hooks,
-                    )
-                )
-            except Exception as e:
+                for result in missing
+            ),
+            return_exceptions=True,
+        )
+        for result, hooks in zip(missing, fallback_hooks):
+            if isinstance(hooks, Exception):
                 # Log error but continue with other industries
-                print(f"Error generating hooks for {result.industry}: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.error(f"Error generating hooks for {result.industry}: {hooks}", exc_info=hooks)
                 continue
+            hooks_by_slug[result.slug] = hooks
+
+        industry_hooks: List[IndustryHooksResponse] = [
+            IndustryHooksResponse(
+                industry=result.industry,
+                slug=result.slug,
+                summary=result.summary,
+                hooks=hooks_by_slug[result.slug],
+            )
+            for result in news_results
+            if result.slug in hooks_by_slug
+        ]
+
+        # Store every industry's hooks in one Supabase insert
+        try:
+            await linkedin_supabase_service.store_news_hooks_bulk(
+                [(ih.industry, ih.slug, ih.summary, ih.hooks) for ih in industry_hooks]
+            )
+        except Exception as e:
+            # Log error but don't fail the request
+            logger.warning(f"Failed to store news hooks in database: {e}")
         
         if not industry_hooks:
             raise HTTPException(
@@ -509,10 +582,7 @@ async def generate_news_hooks(
         raise
     except Exception as e:
         # Catch any unexpected errors and provide better error message
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Unexpected error in generate_news_hooks: {str(e)}")
-        print(error_trace)
+        logger.exception(f"Unexpected error in generate_news_hooks: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
@@ -1,111 +1,115 @@
 from typing import Any, Dict, List
 
+# Each provider's request params (max, limit, pageSize, ...) bound how many
+# items come back, so parsers take the whole payload. Items without a title or
+# URL are dropped here so the service can validate the list as-is.
+
 
 def _parse_gnews(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    articles = []
-    for item in payload.get("articles", []):
-        articles.append(
-            {
-                "title": item.get("title"),
-                "description": item.get("description"),
-                "url": item.get("url"),
-                "published_at": item.get("publishedAt"),
-                "source": (item.get("source") or {}).get("name"),
-            }
-        )
-    return articles
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "url": item.get("url"),
+            "published_at": item.get("publishedAt"),
+            "source": (item.get("source") or {}).get("name"),
+        }
+        for item in payload.get("articles", [])
+        if item.get("title") and item.get("url")
+    ]
 
 
 def _parse_fmp(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    articles = []
-    for item in payload:
-        articles.append(
-            {
-                "title": item.get("title"),
-                "description": item.get("text"),
-                "url": item.get("url"),
-                "published_at": item.get("publishedDate"),
-                "source": item.get("site"),
-            }
-        )
-    return articles
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("text"),
+            "url": item.get("url"),
+            "published_at": item.get("publishedDate"),
+            "source": item.get("site"),
+        }
+        for item in payload
+        if item.get("title") and item.get("url")
+    ]
 
 
 def _parse_newsdata(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    articles = []
-    for item in payload.get("results", []):
-        articles.append(
-            {
-                "title": item.get("title"),
-                "description": item.get("description") or item.get("content"),
-                "url": item.get("link"),
-                "published_at": item.get("pubDate"),
-                "source": item.get("source_id"),
-            }
-        )
-    return articles
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("description") or item.get("content"),
+            "url": item.get("link"),
+            "published_at": item.get("pubDate"),
+            "source": item.get("source_id"),
+        }
+        for item in payload.get("results", [])
+        if item.get("title") and item.get("link")
+    ]
 
 
 def _parse_gdelt(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    articles = []
-    for item in payload.get("articles", []):
-        articles.append(
-            {
-                "title": item.get("title"),
-                "description": item.get("seendate"),
-                "url": item.get("url"),
-                "published_at": item.get("seendate"),
-                "source": item.get("sourceCommonName") or item.get("sourceCountry"),
-            }
-        )
-    return articles
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("seendate"),
+            "url": item.get("url"),
+            "published_at": item.get("seendate"),
+            "source": item.get("sourceCommonName") or item.get("sourceCountry"),
+        }
+        for item in payload.get("articles", [])
+        if item.get("title") and item.get("url")
+    ]
 
 
 def _parse_guardian(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    response = payload.get("response", {})
-    results = response.get("results", [])
-    articles = []
-    for item in results:
-        fields = item.get("fields", {})
-        articles.append(
-            {
-                "title": item.get("webTitle"),
-                "description": fields.get("trailText") or fields.get("headline"),
-                "url": item.get("webUrl"),
-                "published_at": item.get("webPublicationDate"),
-                "source": "The Guardian",
-            }
-        )
-    return articles
+    results = payload.get("response", {}).get("results", [])
+    return [
+        {
+            "title": item.get("webTitle"),
+            "description": (fields := item.get("fields", {})).get("trailText") or fields.get("headline"),
+            "url": item.get("webUrl"),
+            "published_at": item.get("webPublicationDate"),
+            "source": "The Guardian",
+        }
+        for item in results
+        if item.get("webTitle") and item.get("webUrl")
+    ]
 
 
 def _parse_newsapi(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    articles = []
-    for item in payload.get("articles", []):
-        source = item.get("source") or {}
-        articles.append(
-            {
-                "title": item.get("title"),
-                "description": item.get("description"),
-                "url": item.get("url"),
-                "published_at": item.get("publishedAt"),
-                "source": source.get("name"),
-            }
-        )
-    return articles
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "url": item.get("url"),
+            "published_at": item.get("publishedAt"),
+            "source": (item.get("source") or {}).get("name"),
+        }
+        for item in payload.get("articles", [])
+        if item.get("title") and item.get("url")
+    ]
 
 
 def _parse_alphavantage(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    articles = []
-    for item in payload.get("feed", []):
-        articles.append(
-            {
-                "title": item.get("title"),
-                "description": item.get("summary"),
-                "url": item.get("url"),
-                "published_at": item.get("time_published"),
-                "source": item.get("source"),
-            }
-        )
-    return articles[:10]
+    return [
+        {
+            "title": item.get("title"),
+            "description": item.get("summary"),
+            "url": item.get("url"),
+            "published_at": item.get("time_published"),
+            "source": item.get("source"),
+        }
+        for item in payload.get("feed", [])
+        if item.get("title") and item.get("url")
+    ]
+
 
+def _extract_json_object(text: str) -> str:
+    """
+    Slice the outermost {...} out of an LLM reply that may wrap it in prose
+    or a markdown code fence. Returns the text unchanged if there is none.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return text
+    return text[start:end + 1]
@@ -1,9 +1,12 @@
+import asyncio
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple, Union
 
 import httpx
+import orjson
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 
 from .models import (
     Article,
@@ -14,57 +17,272 @@ from .models import (
 )
 
 
+# Validates a provider's whole article list in one pydantic-core call
+_ARTICLES_ADAPTER = TypeAdapter(List[Article])
+
+# Upper bound on provider fetches running at once across bulk requests
+MAX_CONCURRENT_FETCHES = 8
+
+# Provider transport errors and the status each surfaces as, most specific
+# first (httpx.TimeoutException is itself an httpx.HTTPError)
+_PROVIDER_ERRORS = (
+    (httpx.TimeoutException, status.HTTP_504_GATEWAY_TIMEOUT, "timed out"),
+    (httpx.HTTPError, status.HTTP_502_BAD_GATEWAY, "request failed"),
+)
+
+
 class IndustryNewsService:
-    def __init__(self, configs: List[IndustryAPIConfig], summary_builder, cache_ttl_seconds: int = 300) -> None:
+    def __init__(
+        self,
+        configs: List[IndustryAPIConfig],
+        summary_builder,
+        http_client: httpx.AsyncClient,
+        cache_ttl_seconds: int = 300,
+        stale_ttl_seconds: int = 3600,
+    ) -> None:
         self._summary_builder = summary_builder
+        self._http_client = http_client
         self._configs = {config.slug: config for config in configs}
+        self._slug_set = frozenset(self._configs)
+        self._all_slugs = tuple(self._configs)
+        self._available_slugs = ", ".join(self._configs)
         self._cache: Dict[str, Any] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
         self._cache_ttl = cache_ttl_seconds
+        self._stale_ttl = stale_ttl_seconds
+        self._api_keys: Dict[str, Optional[str]] = {}
+        self.reload_keys()
 
-    def list_industries(self) -> List[IndustryInfo]:
-        industries = []
-        for config in self._configs.values():
-            api_key_present = (
-                bool(os.getenv(config.api_key_env)) if config.api_key_env else True
-            )
-            industries.append(
-                IndustryInfo(
-                    slug=config.slug,
-                    industry=config.industry,
-                    provider=config.provider,
-                    requires_api_key=config.requires_api_key,
-                    api_key_env=config.api_key_env,
-                    is_configured=api_key_present,
-                )
+    def reload_keys(self) -> None:
+        """Re-read provider API keys from the environment."""
+        self._api_keys = {
+            slug: os.getenv(config.api_key_env) if config.api_key_env else None
+            for slug, config in self._configs.items()
+        }
+        # The industry list only changes with the keys, so build and
+        # serialize it once here
+        self._industries = tuple(
+            IndustryInfo(
+                slug=config.slug,
+                industry=config.industry,
+                provider=config.provider,
+                requires_api_key=config.requires_api_key,
+                api_key_env=config.api_key_env,
+                is_configured=bool(self._api_keys[config.slug]) if config.api_key_env else True,
             )
-        return industries
+            for config in self._configs.values()
+        )
+        self._industries_json = orjson.dumps(
+            [industry.model_dump() for industry in self._industries]
+        )
+
+    def list_industries_json(self) -> bytes:
+        """The list_industries() payload, pre-serialized to JSON."""
+        return self._industries_json
+
+    def list_industries(self) -> List[IndustryInfo]:
+        return list(self._industries)
 
     def _get_config(self, slug: str) -> IndustryAPIConfig:
         config = self._configs.get(slug)
         if not config:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Unknown industry slug '{slug}'. Available options: {', '.join(self._configs.keys())}",
+                detail=f"Unknown industry slug '{slug}'. Available options: {self._available_slugs}",
             )
         return config
 
+    def _get_cached(self, slug: str) -> Tuple[Optional[IndustryNewsResponse], bool]:
+        """
+        The cached response for a slug and whether it is still fresh.
+
+        Past the fresh TTL a response is still served (and refreshed in the
+        background) until it is older than the stale TTL.
+        """
+        cached = self._cache.get(slug)
+        if not cached:
+            return None, False
+        age = time.time() - cached["timestamp"]
+        if age > self._stale_ttl:
+            return None, False
+        return cached["payload"], age <= self._cache_ttl
+
+    def _cache_response(
+        self, config: IndustryAPIConfig, articles: List[Article], summary: str
+    ) -> IndustryNewsResponse:
+        response = IndustryNewsResponse(
+            industry=config.industry,
+            slug=config.slug,
+            provider=config.provider,
+            articles=articles,
+            summary=summary,
+        )
+        self._cache[config.slug] = {"timestamp": time.time(), "payload": response}
+        return response
+
+    def _clear_inflight(self, slug: str, future: asyncio.Future) -> None:
+        # A background refresh may have nobody awaiting it, so mark any
+        # failure as retrieved rather than have asyncio log it
+        if not future.cancelled():
+            future.exception()
+        if self._inflight.get(slug) is future:
+            del self._inflight[slug]
+
+    def _start_fetch(self, config: IndustryAPIConfig) -> asyncio.Future:
+        """The in-flight fetch for a slug, starting one if there is none."""
+        pending = self._inflight.get(config.slug)
+        if pending is None:
+            pending = asyncio.create_task(self._fetch_industry_news(config))
+            self._inflight[config.slug] = pending
+            pending.add_done_callback(lambda done: self._clear_inflight(config.slug, done))
+        return pending
+
+    def _start_batch(self, configs: List[IndustryAPIConfig]) -> Dict[str, asyncio.Future]:
+        """Start one batched fetch for several slugs, returning a future per slug."""
+        loop = asyncio.get_running_loop()
+        futures = {config.slug: loop.create_future() for config in configs}
+        self._inflight.update(futures)
+        # A separate task, so the batch still completes for anyone else
+        # waiting on these slugs if the caller goes away
+        batch = asyncio.create_task(self._fetch_batch(configs, futures))
+        self._batch_tasks.add(batch)
+        batch.add_done_callback(self._batch_tasks.discard)
+        return futures
+
     async def get_industry_news(
         self, slug: str, refresh_cache: bool = False
     ) -> IndustryNewsResponse:
         config = self._get_config(slug)
 
         if not refresh_cache:
-            cached = self._cache.get(slug)
-            if cached and (time.time() - cached["timestamp"] <= self._cache_ttl):
-                return cached["payload"]
+            cached, fresh = self._get_cached(slug)
+            if cached:
+                if not fresh:
+                    self._start_fetch(config)
+                return cached
+
+        # Concurrent misses for the same slug share one upstream fetch.
+        # Shielded so one caller disconnecting doesn't cancel it for the rest.
+        return await asyncio.shield(self._start_fetch(config))
+
+    async def get_many_industry_news(
+        self, slugs: List[str], refresh_cache: bool = False
+    ) -> List[Union[IndustryNewsResponse, Exception]]:
+        """
+        Fetch several industries, in slug order.
+
+        Cache misses are fetched concurrently and summarized together in one
+        LLM call; stale entries are served as-is and refreshed the same way in
+        a separate background batch. Each slot holds either the response or the exception
+        for that slug, so one failing provider doesn't fail the others.
+        """
+        results: Dict[str, Union[IndustryNewsResponse, Exception]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[IndustryAPIConfig] = []
+        to_refresh: List[IndustryAPIConfig] = []
+
+        for slug in slugs:
+            try:
+                config = self._get_config(slug)
+            except HTTPException as exc:
+                results[slug] = exc
+                continue
+            cached, fresh = (None, False) if refresh_cache else self._get_cached(slug)
+            if cached:
+                results[slug] = cached
+                if not fresh and slug not in self._inflight:
+                    to_refresh.append(config)
+            elif slug in self._inflight:
+                waiting[slug] = self._inflight[slug]
+            else:
+                to_fetch.append(config)
+
+        if to_fetch:
+            waiting.update(self._start_batch(to_fetch))
+        if to_refresh:
+            # A batch of its own, so a slow stale provider can't hold up the
+            # misses this caller is waiting for
+            self._start_batch(to_refresh)
+
+        for slug, future in waiting.items():
+            try:
+                results[slug] = await asyncio.shield(future)
+            except Exception as exc:
+                results[slug] = exc
 
+        return [results[slug] for slug in slugs]
+
+    async def _fetch_batch(
+        self, configs: List[IndustryAPIConfig], futures: Dict[str, asyncio.Future]
+    ) -> None:
+        """Fetch articles for several industries, then summarize them with one LLM call."""
+        try:
+            fetched = await self._gather_bounded(
+                [self._fetch_articles(config) for config in configs]
+            )
+            summaries = await self._summary_builder.build_summaries(
+                [
+                    (config.slug, config.industry, config.provider, articles)
+                    for config, articles in zip(configs, fetched)
+                    if not isinstance(articles, Exception)
+                ]
+            )
+            for config, articles in zip(configs, fetched):
+                future = futures[config.slug]
+                if isinstance(articles, Exception):
+                    future.set_exception(articles)
+                else:
+                    future.set_result(
+                        self._cache_response(config, articles, summaries[config.slug])
+                    )
+        except Exception as exc:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            for slug, future in futures.items():
+                if not future.done():
+                    future.cancel()
+                self._clear_inflight(slug, future)
+
+    async def _gather_bounded(self, coroutines: List[Awaitable[Any]]) -> List[Any]:
+        """
+        Run coroutines concurrently under the shared fetch semaphore, in order.
+
+        Each slot holds either the result or the exception raised, so one
+        failure doesn't cancel the rest of the TaskGroup.
+        """
+        results: List[Any] = [None] * len(coroutines)
+
+        async def run(index: int, coroutine: Awaitable[Any]) -> None:
+            async with self._fetch_semaphore:
+                try:
+                    results[index] = await coroutine
+                except Exception as exc:
+                    results[index] = exc
+
+        async with asyncio.TaskGroup() as task_group:
+            for index, coroutine in enumerate(coroutines):
+                task_group.create_task(run(index, coroutine))
+        return results
+
+    async def _fetch_industry_news(self, config: IndustryAPIConfig) -> IndustryNewsResponse:
+        articles = await self._fetch_articles(config)
+        summary = await self._summary_builder.build_summary(
+            config.industry, config.provider, articles
+        )
+        return self._cache_response(config, articles, summary)
+
+    async def _fetch_articles(self, config: IndustryAPIConfig) -> List[Article]:
         api_key = None
         if config.requires_api_key:
-            api_key = os.getenv(config.api_key_env or "")
+            api_key = self._api_keys[config.slug]
             if not api_key:
                 raise HTTPException(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"{config.provider} API key missing. Set {config.api_key_env} to enable {config.industry} coverage.",
+                    detail=config.missing_key_detail,
                 )
 
         try:
@@ -73,35 +291,19 @@ class IndustryNewsService:
         except MissingAPIKey:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"{config.provider} configuration incomplete. Please set {config.api_key_env}.",
-            )
-        except httpx.TimeoutException as exc:
-            raise HTTPException(
-                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                detail=f"{config.provider} timed out: {exc}",
+                detail=config.incomplete_config_detail,
             )
         except httpx.HTTPError as exc:
+            status_code, reason = next(
+                (code, reason) for error_type, code, reason in _PROVIDER_ERRORS
+                if isinstance(exc, error_type)
+            )
             raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"{config.provider} request failed: {exc}",
+                status_code=status_code,
+                detail=f"{config.provider} {reason}: {exc}",
             )
 
-        articles = [Article(**article) for article in articles_dicts if article.get("title") and article.get("url")]
-
-        summary = await self._summary_builder.build_summary(
-            config.industry, config.provider, articles
-        )
-
-        response = IndustryNewsResponse(
-            industry=config.industry,
-            slug=config.slug,
-            provider=config.provider,
-            articles=articles,
-            summary=summary,
-        )
-
-        self._cache[slug] = {"timestamp": time.time(), "payload": response}
-        return response
+        return _ARTICLES_ADAPTER.validate_python(articles_dicts)
 
     async def _execute_request(
         self, config: IndustryAPIConfig, api_key: Optional[str]
@@ -109,30 +311,32 @@ class IndustryNewsService:
         if config.requires_api_key and not api_key:
             raise MissingAPIKey
 
-        params = config.params_builder(api_key)
+        params = (
+            config.params
+            if config.api_key_param is None
+            else {**config.params, config.api_key_param: api_key}
+        )
 
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            response = await client.get(config.endpoint, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self._http_client.get(
+            config.endpoint, params=params, timeout=config.timeout
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     def resolve_slugs(self, requested: Optional[str]) -> List[str]:
         if not requested:
-            return list(self._configs.keys())
-        slugs = [slug.strip() for slug in requested.split(",") if slug.strip()]
-        if not slugs:
+            return list(self._all_slugs)
+        # dict.fromkeys deduplicates while preserving order
+        ordered = list(dict.fromkeys(
+            slug for slug in (raw_slug.strip() for raw_slug in requested.split(",")) if slug
+        ))
+        unknown = set(ordered) - self._slug_set
+        if unknown:
+            # raises the 404 for the first unknown slug, in request order
+            self._get_config(next(slug for slug in ordered if slug in unknown))
+        if not ordered:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No valid industries were provided.",
             )
-        for slug in slugs:
-            self._get_config(slug)
-        # deduplicate while preserving order
-        seen = set()
-        ordered = []
-        for slug in slugs:
-            if slug not in seen:
-                ordered.append(slug)
-                seen.add(slug)
         return ordered
-
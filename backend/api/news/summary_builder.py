@@ -1,24 +1,48 @@
-import os
-from typing import TYPE_CHECKING, List, Optional
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from fastapi.concurrency import run_in_threadpool
 import anthropic
+import orjson
+
+from utils.anthropic_client import anthropic_client
+
+from .llm_cache import llm_cache
+from .parsers import _extract_json_object
 
 if TYPE_CHECKING:
     from .models import Article
 
+# (slug, industry, provider, articles) for one industry in a batched summary
+SummaryRequest = Tuple[str, str, str, List["Article"]]
+
+# Upper bound on summary LLM calls in flight at once, so a burst of cache
+# misses can't exceed the account's rate limit
+MAX_CONCURRENT_SUMMARIES = 4
+
+SUMMARY_SYSTEM_PROMPT = "You are a chief-of-staff producing sharp competitive briefs."
+
+SUMMARY_PROMPT_TEMPLATE = (
+    "Summarize the following industry headlines into 2 concise sentences "
+    "calling out the most actionable developments.\n"
+    "Industry: {industry}\n"
+    "Provider: {provider}\n"
+    "Headlines:\n{bullets}"
+)
+
 
 class NewsSummaryBuilder:
     """Generates condensed summaries with Anthropic when available."""
 
     def __init__(self) -> None:
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        self.client: Optional[anthropic.Anthropic] = anthropic.Anthropic(api_key=api_key) if api_key else None
+        self.client: Optional[anthropic.AsyncAnthropic] = anthropic_client
+        self._llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
 
     async def build_summary(
         self, industry: str, provider: str, articles: List["Article"]
     ) -> str:
-        top_headlines = [article.title for article in articles if article.title][:5]
+        # Parsers drop untitled articles, so the first five carry the headlines
+        top_articles = articles[:5]
+        top_headlines = [article.title for article in top_articles]
         if not top_headlines:
             return f"No recent {industry.lower()} headlines are available."
 
@@ -26,46 +50,120 @@ class NewsSummaryBuilder:
             return self._build_fallback_summary(industry, top_headlines)
 
         try:
-            return await run_in_threadpool(
-                self._call_llm, industry, provider, articles[:5]
-            )
+            return await self._call_llm(industry, provider, top_articles, top_headlines)
         except Exception:
             return self._build_fallback_summary(industry, top_headlines)
 
+    async def build_summaries(self, requests: List[SummaryRequest]) -> Dict[str, str]:
+        """
+        Summaries for several industries keyed by slug, from one LLM call.
+
+        Industries the batched call doesn't cover (no headlines, no client, or
+        missing from the reply) fall back to build_summary, run concurrently
+        under the shared summary semaphore.
+        """
+        summaries: Dict[str, str] = {}
+        with_headlines = [request for request in requests if request[3]]
+        if self.client and len(with_headlines) > 1:
+            try:
+                summaries = await self._call_llm_batch(with_headlines)
+            except Exception:
+                summaries = {}
+
+        remaining = [request for request in requests if request[0] not in summaries]
+        individual = await asyncio.gather(
+            *(
+                self.build_summary(industry, provider, articles)
+                for _, industry, provider, articles in remaining
+            )
+        )
+        summaries.update(zip((request[0] for request in remaining), individual))
+        return summaries
+
     def _build_fallback_summary(self, industry: str, headlines: List[str]) -> str:
         joined = "; ".join(headlines)
         return f"{industry} snapshot: {joined}"
 
-    def _call_llm(
-        self, industry: str, provider: str, articles: List["Article"]
+    def _build_bullet_block(self, articles: List["Article"]) -> str:
+        # Join on "\n" rather than os.linesep so the prompt is the same on every host
+        return "\n".join(
+            f"- {article.title}: {article.description or ''}" for article in articles
+        )
+
+    async def _call_llm(
+        self, industry: str, provider: str, articles: List["Article"], headlines: List[str]
     ) -> str:
         if not self.client:
-            return self._build_fallback_summary(industry, [a.title for a in articles])
+            return self._build_fallback_summary(industry, headlines)
 
-        bullet_lines = []
-        for article in articles:
-            description = article.description or ""
-            bullet_lines.append(f"- {article.title}: {description}")
-
-        prompt = (
-            "Summarize the following industry headlines into 2 concise sentences "
-            "calling out the most actionable developments.\n"
-            f"Industry: {industry}\n"
-            f"Provider: {provider}\n"
-            f"Headlines:\n{os.linesep.join(bullet_lines)}"
+        prompt = SUMMARY_PROMPT_TEMPLATE.format(
+            industry=industry,
+            provider=provider,
+            bullets=self._build_bullet_block(articles),
         )
 
-        response = self.client.messages.create(
-            model="claude-haiku-4-5",
-            max_tokens=200,
-            temperature=0.3,
-            system="You are a chief-of-staff producing sharp competitive briefs.",
-            messages=[
+        request = {
+            "model": "claude-haiku-4-5",
+            "max_tokens": 200,
+            "temperature": 0.3,
+            "system": SUMMARY_SYSTEM_PROMPT,
+            "messages": [
                 {"role": "user", "content": prompt},
             ],
-        )
+        }
+        cache_key = llm_cache.make_key(**request)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self._llm_semaphore:
+            response = await self.client.messages.create(**request)
         content = response.content[0].text if response.content and len(response.content) > 0 else None
         if not content:
-            return self._build_fallback_summary(industry, [a.title for a in articles])
+            return self._build_fallback_summary(industry, headlines)
+        llm_cache.set(cache_key, content.strip())
         return content.strip()
 
+    async def _call_llm_batch(self, requests: List[SummaryRequest]) -> Dict[str, str]:
+        sections = "\n\n".join(
+            f"[{slug}]\n"
+            f"Industry: {industry}\n"
+            f"Provider: {provider}\n"
+            f"Headlines:\n{self._build_bullet_block(articles[:5])}"
+            for slug, industry, provider, articles in requests
+        )
+        prompt = (
+            "For each industry below, summarize its headlines into 2 concise sentences "
+            "calling out the most actionable developments.\n"
+            'Return only a JSON object of the form {"summaries": {"<slug>": "<summary>"}} '
+            "with one entry per bracketed slug.\n\n"
+            f"{sections}"
+        )
+
+        request = {
+            "model": "claude-haiku-4-5",
+            "max_tokens": 200 * len(requests),
+            "temperature": 0.3,
+            "system": SUMMARY_SYSTEM_PROMPT,
+            "messages": [
+                {"role": "user", "content": prompt},
+            ],
+        }
+        cache_key = llm_cache.make_key(**request)
+        content = llm_cache.get(cache_key)
+        if content is None:
+            async with self._llm_semaphore:
+                response = await self.client.messages.create(**request)
+            content = response.content[0].text if response.content and len(response.content) > 0 else ""
+
+        parsed = orjson.loads(_extract_json_object(content))
+
+        slugs = {summary_request[0] for summary_request in requests}
+        summaries = {
+            slug: summary.strip()
+            for slug, summary in (parsed.get("summaries") or {}).items()
+            if slug in slugs and isinstance(summary, str) and summary.strip()
+        }
+        if summaries:
+            llm_cache.set(cache_key, content)
+        return summaries
@@ -1,19 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import Annotated, Optional
+import time
+from typing import Annotated, Any, Dict, Optional, Tuple
 from auth import get_current_user
-from supabase import create_client, Client
-import os
+from supabase import Client
 from pydantic import BaseModel
+from utils.supabase_query import execute
+from utils.supabase_clients import get_admin_client
 
 router = APIRouter(prefix="/api/onboarding", tags=["onboarding"])
 
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_ANON_KEY = os.environ["SUPABASE_ANON_KEY"]
-SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")  # optional, but recommended for server writes
-
-# Public client (anon key): good for auth flows and reads with RLS
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-
 class OnboardingData(BaseModel):
     name: str
     company: str
@@ -26,10 +21,45 @@ class OnboardingData(BaseModel):
     selected_goals: list[str]
     selected_hooks: list[str]
 
-# Admin client (service role): bypasses RLS for trusted server-side writes
-admin: Optional[Client] = None
-if SUPABASE_SERVICE_ROLE_KEY:
-    admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+# Admin client (service role): bypasses RLS for trusted server-side writes.
+# Optional, but recommended for server writes.
+admin: Optional[Client] = get_admin_client()
+
+# Onboarding rows only change on POST /data, so reads are served from a short
+# in-process cache that the POST refreshes
+ONBOARDING_CACHE_TTL_SECONDS = 60
+ONBOARDING_CACHE_MAX_ENTRIES = 10_000
+
+# user_id -> (cache expiry timestamp, onboarding row)
+_onboarding_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _cache_onboarding_row(user_id: str, row: Dict[str, Any]) -> None:
+    _onboarding_cache.pop(user_id, None)
+    if len(_onboarding_cache) >= ONBOARDING_CACHE_MAX_ENTRIES:
+        # dicts keep insertion order, so this drops the oldest entry
+        del _onboarding_cache[next(iter(_onboarding_cache))]
+    _onboarding_cache[user_id] = (time.time() + ONBOARDING_CACHE_TTL_SECONDS, row)
+
+
+async def get_onboarding_row(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The user's onboarding_context row, or None if they haven't onboarded.
+    """
+    cached = _onboarding_cache.get(user_id)
+    if cached and cached[0] > time.time():
+        return cached[1]
+
+    if admin is None:
+        raise HTTPException(status_code=500, detail="Admin client not available")
+
+    result = await execute(admin.table("onboarding_context").select("*").eq("user_id", user_id))
+    if not result.data:
+        return None
+
+    _cache_onboarding_row(user_id, result.data[0])
+    return result.data[0]
+
 
 @router.get("/data")
 async def get_onboarding_data(current_user: Annotated[dict, Depends(get_current_user)]):
@@ -37,17 +67,14 @@ async def get_onboarding_data(current_user: Annotated[dict, Depends(get_current_
     Get user's onboarding data
     """
     try:
-        if admin is None:
-            raise HTTPException(status_code=500, detail="Admin client not available")
-        
-        result = admin.table("onboarding_context").select("*").eq("user_id", current_user["id"]).execute()
+        row = await get_onboarding_row(current_user["id"])
         
-        if not result.data:
+        if not row:
             return {"message": "No onboarding data found", "data": None}
         
         return {
             "message": "Onboarding data retrieved successfully",
-            "data": result.data[0]
+            "data": row
         }
         
     except Exception as e:
@@ -63,7 +90,7 @@ async def submit_onboarding_data(current_user: Annotated[dict, Depends(get_curre
             raise HTTPException(status_code=500, detail="Admin client not available")
         
         # Use upsert to handle both insert and update (since user_id is UNIQUE)
-        result = admin.table("onboarding_context").upsert({
+        result = await execute(admin.table("onboarding_context").upsert({
             "user_id": current_user["id"],
             "name": onboarding_data.name,
             "company": onboarding_data.company,
@@ -75,10 +102,13 @@ async def submit_onboarding_data(current_user: Annotated[dict, Depends(get_curre
             "topics_to_post": onboarding_data.topics_to_post,
             "selected_goals": onboarding_data.selected_goals,
             "selected_hooks": onboarding_data.selected_hooks
-        }, on_conflict="user_id").execute()
+        }, on_conflict="user_id"))
     except Exception as e:
+        # The write may or may not have landed, so don't serve the old row
+        _onboarding_cache.pop(current_user["id"], None)
         raise HTTPException(status_code=500, detail=f"Error submitting onboarding data: {str(e)}")
     
+    _cache_onboarding_row(current_user["id"], result.data[0])
     return {
         "message": "Onboarding data submitted successfully",
         "data": result.data[0]
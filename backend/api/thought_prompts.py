@@ -8,6 +8,8 @@ Provides endpoints for:
 - GET /api/thought-prompts/my-responses - Get user's previous responses
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Annotated, Optional, List
 from pydantic import BaseModel, Field
@@ -295,16 +297,16 @@ async def get_my_responses(
                 detail="Offset must be non-negative"
             )
         
-        # Get responses with prompt questions
-        responses = await thought_prompts_service.get_user_responses(
-            user_id=user_id,
-            limit=limit,
-            offset=offset
+        # Get responses with prompt questions and the total count concurrently
+        responses, total_count = await asyncio.gather(
+            thought_prompts_service.get_user_responses(
+                user_id=user_id,
+                limit=limit,
+                offset=offset
+            ),
+            thought_prompts_service.get_user_responses_count(user_id),
         )
         
-        # Get total count
-        total_count = await thought_prompts_service.get_user_responses_count(user_id)
-        
         return GetResponsesResult(
             success=True,
             data=[
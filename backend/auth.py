@@ -4,9 +4,10 @@ from datetime import datetime, timedelta
 from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie
 from pydantic import BaseModel, EmailStr
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
 from config import FRONTEND_ORIGIN, IS_DEV
+from utils.supabase_clients import get_admin_client, get_anon_client
 
 load_dotenv()
 
@@ -18,16 +19,9 @@ JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-# Supabase Configuration
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_ANON_KEY = os.environ["SUPABASE_ANON_KEY"]
-SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-
 # Supabase clients
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-admin: Optional[Client] = None
-if SUPABASE_SERVICE_ROLE_KEY:
-    admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+supabase: Client = get_anon_client()
+admin: Optional[Client] = get_admin_client()
 
 # Router for auth endpoints
 auth_router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -0,0 +1,6 @@
+-- Indexes for paginating linkedin_generated_hooks per user
+-- SupabaseService.get_user_hooks filters by user_id, orders by created_at DESC and
+-- requests an exact count in the same round-trip, so a composite index lets
+-- both the page and the count be served from one index scan.
+CREATE INDEX IF NOT EXISTS idx_linkedin_generated_hooks_user_created_at
+    ON linkedin_generated_hooks(user_id, created_at DESC);
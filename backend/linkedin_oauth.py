@@ -1,7 +1,8 @@
-import httpx
 import os
 import secrets
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from utils.http_client import linkedin_http_client
 
 class LinkedInOAuth:
     def __init__(self):
@@ -10,9 +11,9 @@ class LinkedInOAuth:
         self.redirect_uri = os.getenv('LINKEDIN_REDIRECT_URI', 'http://localhost:3000/linkedin-connect/callback')
         self.scope = 'w_member_social profile email openid'
         
-    def get_auth_url(self) -> Dict[str, str]:
-        """Generate LinkedIn OAuth authorization URL"""
-        state = secrets.token_urlsafe(32)
+    def get_auth_url(self, state: Optional[str] = None) -> Dict[str, str]:
+        """Generate LinkedIn OAuth authorization URL, using a random state unless one is given"""
+        state = state or secrets.token_urlsafe(32)
         
         auth_url = (
             f"https://www.linkedin.com/oauth/v2/authorization?"
@@ -37,13 +38,12 @@ class LinkedInOAuth:
             "client_secret": self.client_secret,
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"Token exchange failed: {response.text}")
+        response = await linkedin_http_client.post(token_url, data=data)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"Token exchange failed: {response.text}")
     
     async def get_user_profile(self, access_token: str) -> Dict[str, Any]:
         """Get user's LinkedIn profile information using OpenID Connect"""
@@ -53,10 +53,9 @@ class LinkedInOAuth:
             "X-Restli-Protocol-Version": "2.0.0"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(profile_url, headers=headers)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"Profile fetch failed: {response.text}")
+        response = await linkedin_http_client.get(profile_url, headers=headers)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"Profile fetch failed: {response.text}")
@@ -1,8 +1,27 @@
-import httpx
 import os
 from fastapi import UploadFile
 from typing import Optional, Tuple
 
+from utils.http_client import linkedin_http_client
+
+# Chunk size used when streaming image uploads to LinkedIn
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def _iter_upload(image_file: UploadFile):
+    """Yield the uploaded file in chunks so it is never held in memory whole"""
+    await image_file.seek(0)
+    while chunk := await image_file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+def upload_size(image_file: UploadFile) -> int:
+    """Size of the uploaded file, measured without reading it"""
+    if image_file.size is not None:
+        return image_file.size
+    image_file.file.seek(0, os.SEEK_END)
+    size = image_file.file.tell()
+    image_file.file.seek(0)
+    return size
+
 class LinkedInService:
     def __init__(self, access_token=None):
         self.access_token = access_token or os.getenv('LINKEDIN_ACCESS_TOKEN')
@@ -35,29 +54,28 @@ class LinkedInService:
                 "X-Restli-Protocol-Version": "2.0.0"
             }
             
-            async with httpx.AsyncClient() as client:
-                # Step 1: Register upload
-                register_response = await client.post(register_url, json=register_payload, headers=headers)
-                
-                if register_response.status_code != 200:
-                    return None, f"Register upload failed: {register_response.text}"
-                
-                register_data = register_response.json()
-                upload_url = register_data["value"]["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
-                asset_urn = register_data["value"]["asset"]
-                
-                # Step 2: Upload image
-                image_content = await image_file.read()
-                upload_headers = {
-                    "media-type-family": "STILLIMAGE"
-                }
-                
-                upload_response = await client.put(upload_url, content=image_content, headers=upload_headers)
-                
-                if upload_response.status_code not in [200, 201]:
-                    return None, f"Image upload failed: {upload_response.text}"
-                
-                return asset_urn, None
+            # Step 1: Register upload
+            register_response = await linkedin_http_client.post(register_url, json=register_payload, headers=headers)
+            
+            if register_response.status_code != 200:
+                return None, f"Register upload failed: {register_response.text}"
+            
+            register_data = register_response.json()
+            upload_url = register_data["value"]["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
+            asset_urn = register_data["value"]["asset"]
+            
+            # Step 2: Stream image to LinkedIn with a known length (no chunked encoding)
+            upload_headers = {
+                "media-type-family": "STILLIMAGE",
+                "Content-Length": str(upload_size(image_file))
+            }
+            
+            upload_response = await linkedin_http_client.put(upload_url, content=_iter_upload(image_file), headers=upload_headers)
+            
+            if upload_response.status_code not in [200, 201]:
+                return None, f"Image upload failed: {upload_response.text}"
+            
+            return asset_urn, None
                 
         except Exception as e:
             return None, f"Image upload error: {str(e)}"
@@ -110,27 +128,26 @@ class LinkedInService:
             }
             
             # Step 3: Post to LinkedIn
-            async with httpx.AsyncClient() as client:
-                response = await client.post(linkedin_url, json=payload, headers=headers)
+            response = await linkedin_http_client.post(linkedin_url, json=payload, headers=headers)
+            
+            if response.status_code == 201:
+                response_data = response.json()
+                print(f"LinkedIn API Response: {response_data}")  # Debug logging
                 
-                if response.status_code == 201:
-                    response_data = response.json()
-                    print(f"LinkedIn API Response: {response_data}")  # Debug logging
-                    
-                    # Try different possible ID fields
-                    post_id = (response_data.get("id") or 
-                              response_data.get("activity") or 
-                              response_data.get("activityId") or
-                              "unknown")
-                    
-                    return {
-                        "id": post_id,
-                        "message": "Post created successfully",
-                        "linkedin_url": f"https://www.linkedin.com/feed/update/{post_id}",
-                        "raw_response": response_data  # For debugging
-                    }
-                else:
-                    return {"error": f"LinkedIn API error: {response.status_code} - {response.text}"}
+                # Try different possible ID fields
+                post_id = (response_data.get("id") or 
+                          response_data.get("activity") or 
+                          response_data.get("activityId") or
+                          "unknown")
+                
+                return {
+                    "id": post_id,
+                    "message": "Post created successfully",
+                    "linkedin_url": f"https://www.linkedin.com/feed/update/{post_id}",
+                    "raw_response": response_data  # For debugging
+                }
+            else:
+                return {"error": f"LinkedIn API error: {response.status_code} - {response.text}"}
                     
         except Exception as e:
             return {"error": f"Error posting to LinkedIn: {str(e)}"}
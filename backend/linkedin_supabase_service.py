@@ -1,12 +1,19 @@
 import os
-from supabase import create_client, Client
-from typing import Optional, Dict, Any, List
+import time
+from supabase import Client
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from utils.supabase_query import execute
+from utils.supabase_clients import get_admin_client
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Upper bound on how long a LinkedIn token stays in the in-process cache
+TOKEN_CACHE_TTL_SECONDS = 3600
+
 class SupabaseService:
     def __init__(self):
         self.supabase_url = os.getenv('SUPABASE_URL')
@@ -15,7 +22,9 @@ class SupabaseService:
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment variables")
         
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+        self.supabase: Client = get_admin_client()
+        # user_id -> (cache expiry timestamp, token row)
+        self._token_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
     
     async def store_linkedin_token(self, user_id: str, access_token: str, profile_data: Dict[str, Any], refresh_token: Optional[str] = None) -> bool:
         """
@@ -26,7 +35,7 @@ class SupabaseService:
             expires_at = datetime.utcnow() + timedelta(days=60)
             
             # Check if user already has a token
-            existing = self.supabase.table('linkedin_tokens').select('*').eq('user_id', user_id).execute()
+            existing = await execute(self.supabase.table('linkedin_tokens').select('*').eq('user_id', user_id))
             
             token_data = {
                 'user_id': user_id,
@@ -39,18 +48,19 @@ class SupabaseService:
             
             if existing.data and len(existing.data) > 0:
                 # Update existing token
-                result = self.supabase.table('linkedin_tokens').update(token_data).eq('user_id', user_id).execute()
+                result = await execute(self.supabase.table('linkedin_tokens').update(token_data).eq('user_id', user_id))
                 logger.info(f"Updated LinkedIn token for user {user_id}")
             else:
                 # Insert new token
                 token_data['created_at'] = datetime.utcnow().isoformat()
-                result = self.supabase.table('linkedin_tokens').insert(token_data).execute()
+                result = await execute(self.supabase.table('linkedin_tokens').insert(token_data))
                 logger.info(f"Inserted new LinkedIn token for user {user_id}")
             
             if not result.data or len(result.data) == 0:
                 logger.error(f"Database operation returned no data for user {user_id}")
                 return False
             
+            self._token_cache.pop(user_id, None)
             return True
             
         except Exception as e:
@@ -59,20 +69,29 @@ class SupabaseService:
     
     async def get_linkedin_token(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get LinkedIn OAuth token from Supabase
+        Get LinkedIn OAuth token, served from the in-process cache when possible
         """
+        cached = self._token_cache.get(user_id)
+        if cached and time.time() < cached[0]:
+            return cached[1]
+        
         try:
-            result = self.supabase.table('linkedin_tokens').select('*').eq('user_id', user_id).execute()
+            result = await execute(self.supabase.table('linkedin_tokens').select('*').eq('user_id', user_id))
             
             if result.data:
                 token_data = result.data[0]
                 
                 # Check if token is expired
                 expires_at = datetime.fromisoformat(token_data['expires_at'].replace('Z', '+00:00'))
-                if datetime.utcnow().replace(tzinfo=expires_at.tzinfo) > expires_at:
+                now = datetime.utcnow().replace(tzinfo=expires_at.tzinfo)
+                if now > expires_at:
                     print(f"Token expired for user {user_id}")
+                    self._token_cache.pop(user_id, None)
                     return None
                 
+                # Never cache a token past its own expiry
+                ttl = min((expires_at - now).total_seconds(), TOKEN_CACHE_TTL_SECONDS)
+                self._token_cache[user_id] = (time.time() + ttl, token_data)
                 return token_data
             
             return None
@@ -86,7 +105,8 @@ class SupabaseService:
         Delete LinkedIn OAuth token from Supabase
         """
         try:
-            result = self.supabase.table('linkedin_tokens').delete().eq('user_id', user_id).execute()
+            self._token_cache.pop(user_id, None)
+            result = await execute(self.supabase.table('linkedin_tokens').delete().eq('user_id', user_id))
             return len(result.data) > 0
             
         except Exception as e:
@@ -137,7 +157,7 @@ class SupabaseService:
             
             # Insert new record (each generation is a new record)
             payload['created_at'] = now_iso
-            result = self.supabase.table('linkedin_generated_hooks').insert(payload).execute()
+            result = await execute(self.supabase.table('linkedin_generated_hooks').insert(payload))
             
             if not result.data or len(result.data) == 0:
                 raise Exception("Database returned no data after insert")
@@ -157,17 +177,20 @@ class SupabaseService:
         user_id: str,
         limit: int = 10,
         offset: int = 0
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
         Retrieve generated hooks for a user with pagination.
         
+        The total count comes back with the page (count='exact'), so callers
+        don't need a second query to paginate.
+        
         Args:
             user_id: UUID of the user
             limit: Maximum number of records to return (default 10, max 50)
             offset: Number of records to skip for pagination
             
         Returns:
-            List of hook generation records, ordered by created_at DESC
+            Tuple of (hook generation records ordered by created_at DESC, total count)
             
         Raises:
             ValueError: If parameters are invalid
@@ -181,54 +204,62 @@ class SupabaseService:
             raise ValueError("Offset must be non-negative")
         
         try:
-            result = (
+            result = await execute(
                 self.supabase
                 .table('linkedin_generated_hooks')
-                .select('*')
+                .select('*', count='exact')
                 .eq('user_id', user_id)
                 .order('created_at', desc=True)
                 .range(offset, offset + limit - 1)
-                .execute()
             )
             
-            logger.info(f"Retrieved {len(result.data) if result.data else 0} hook records for user {user_id}")
-            return result.data if result.data else []
+            rows = result.data if result.data else []
+            count = result.count if hasattr(result, 'count') and result.count is not None else 0
+            logger.info(f"Retrieved {len(rows)} of {count} hook records for user {user_id}")
+            return rows, count
             
         except Exception as e:
             logger.error(f"Error retrieving hooks for user {user_id}: {e}")
             raise Exception(f"Failed to retrieve hooks: {str(e)}")
     
-    async def get_hooks_count(self, user_id: str) -> int:
+    # News Hooks Storage Methods
+    
+    def _build_news_hooks_payload(
+        self,
+        industry: str,
+        industry_slug: str,
+        summary: str,
+        hooks: List[str],
+        created_at: str
+    ) -> Dict[str, Any]:
         """
-        Get the total number of hook generations for a user.
+        Validate one industry's news hooks and build its news_hooks row.
         
-        Args:
-            user_id: UUID of the user
-            
-        Returns:
-            Integer count of hook generation records
-            
         Raises:
-            Exception: If database operation fails
+            ValueError: If parameters are invalid
         """
-        try:
-            result = (
-                self.supabase
-                .table('linkedin_generated_hooks')
-                .select('id', count='exact')
-                .eq('user_id', user_id)
-                .execute()
-            )
-            
-            count = result.count if hasattr(result, 'count') and result.count is not None else 0
-            logger.info(f"User {user_id} has {count} hook generations")
-            return count
-            
-        except Exception as e:
-            logger.error(f"Error counting hooks for user {user_id}: {e}")
-            raise Exception(f"Failed to count hooks: {str(e)}")
-    
-    # News Hooks Storage Methods
+        if not industry or not isinstance(industry, str):
+            raise ValueError("Industry must be a non-empty string")
+        
+        if not industry_slug or not isinstance(industry_slug, str):
+            raise ValueError("Industry slug must be a non-empty string")
+        
+        if not summary or not isinstance(summary, str):
+            raise ValueError("Summary must be a non-empty string")
+        
+        if not hooks or not isinstance(hooks, list):
+            raise ValueError("Hooks must be a non-empty list")
+        
+        if not all(isinstance(hook, str) and hook.strip() for hook in hooks):
+            raise ValueError("All hooks must be non-empty strings")
+        
+        return {
+            'industry': industry,
+            'industry_slug': industry_slug,
+            'summary': summary,
+            'hooks': hooks,
+            'created_at': created_at,
+        }
     
     async def store_news_hooks(
         self,
@@ -253,48 +284,52 @@ class SupabaseService:
             ValueError: If parameters are invalid
             Exception: If database operation fails
         """
-        # Validation
-        if not industry or not isinstance(industry, str):
-            raise ValueError("Industry must be a non-empty string")
-        
-        if not industry_slug or not isinstance(industry_slug, str):
-            raise ValueError("Industry slug must be a non-empty string")
-        
-        if not summary or not isinstance(summary, str):
-            raise ValueError("Summary must be a non-empty string")
-        
-        if not hooks or not isinstance(hooks, list):
-            raise ValueError("Hooks must be a non-empty list")
+        stored = await self.store_news_hooks_bulk([(industry, industry_slug, summary, hooks)])
+        return stored[0]
+    
+    async def store_news_hooks_bulk(
+        self,
+        rows: List[Tuple[str, str, str, List[str]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Store news summaries and hooks for several industries in one insert.
         
-        if not all(isinstance(hook, str) and hook.strip() for hook in hooks):
-            raise ValueError("All hooks must be non-empty strings")
+        Args:
+            rows: (industry, industry_slug, summary, hooks) per industry
+            
+        Returns:
+            List of the stored records, in insert order
+            
+        Raises:
+            ValueError: If any row is invalid (nothing is stored)
+            Exception: If database operation fails
+        """
+        if not rows:
+            return []
         
         try:
             now_iso = datetime.utcnow().isoformat()
             
-            # Prepare payload
-            payload = {
-                'industry': industry,
-                'industry_slug': industry_slug,
-                'summary': summary,
-                'hooks': hooks,
-                'created_at': now_iso,
-            }
+            # Validate every row before inserting any of them
+            payload = [
+                self._build_news_hooks_payload(industry, industry_slug, summary, hooks, now_iso)
+                for industry, industry_slug, summary, hooks in rows
+            ]
             
-            # Insert new record
-            result = self.supabase.table('news_hooks').insert(payload).execute()
+            # PostgREST inserts all rows in one request
+            result = await execute(self.supabase.table('news_hooks').insert(payload))
             
             if not result.data or len(result.data) == 0:
                 raise Exception("Database returned no data after insert")
             
-            logger.info(f"Successfully stored news hooks for industry: {industry}")
-            return result.data[0]
+            logger.info(f"Successfully stored news hooks for industries: {', '.join(row['industry'] for row in payload)}")
+            return result.data
             
         except ValueError as ve:
             logger.error(f"Validation error storing news hooks: {ve}")
             raise
         except Exception as e:
-            logger.error(f"Error storing news hooks for {industry}: {e}")
+            logger.error(f"Error storing news hooks: {e}")
             raise Exception(f"Failed to store news hooks: {str(e)}")
     
     async def get_news_hooks(
@@ -330,11 +365,15 @@ class SupabaseService:
             if created_after:
                 query = query.gte('created_at', created_after)
             
-            result = query.execute()
+            result = await execute(query)
             
             logger.info(f"Retrieved {len(result.data) if result.data else 0} news hook records")
             return result.data if result.data else []
             
         except Exception as e:
             logger.error(f"Error retrieving news hooks: {e}")
-            raise Exception(f"Failed to retrieve news hooks: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to retrieve news hooks: {str(e)}")
+
+
+# Shared instance so every router reuses one Supabase client and token cache
+linkedin_supabase_service = SupabaseService()
@@ -1,8 +1,14 @@
+import logging
 import os
-from typing import Annotated
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Annotated, Tuple
 
+from anyio import to_thread
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from config import get_cors_origins
@@ -15,10 +21,51 @@ from api.hooks import router as hooks_router
 from api.onboarding import router as onboarding_router
 from api.news import router as news_router
 from api.thought_prompts import router as thought_prompts_router
+from utils.http_client import linkedin_http_client, news_http_client
+from utils.anthropic_client import anthropic_client
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+# Optional override for the worker threads used by sync routes and offloaded
+# blocking calls. Unset keeps anyio's default of 40.
+THREADPOOL_SIZE = os.environ.get("THREADPOOL_SIZE")
+
+
+def start_log_listener() -> Tuple[QueueHandler, QueueListener]:
+    """
+    Send app log records through a queue so the event loop only enqueues them;
+    a background thread does the actual stream writes. Returns the root
+    handler too, so shutdown can detach it before stopping the listener.
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    queue_handler = QueueHandler(log_queue)
+    logging.getLogger().addHandler(queue_handler)
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return queue_handler, listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if THREADPOOL_SIZE:
+        to_thread.current_default_thread_limiter().total_tokens = int(THREADPOOL_SIZE)
+    log_handler, log_listener = start_log_listener()
+    try:
+        yield
+        await linkedin_http_client.aclose()
+        await news_http_client.aclose()
+        if anthropic_client:
+            await anthropic_client.close()
+    finally:
+        # Detach first so nothing is queued after the listener stops, and a
+        # restart in the same process doesn't add a second handler
+        logging.getLogger().removeHandler(log_handler)
+        log_listener.stop()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Enable CORS so frontend can talk to backend
 app.add_middleware(
@@ -7,11 +7,14 @@ Uses Supabase as the backend database.
 
 import os
 import random
-from supabase import create_client, Client
+from supabase import Client
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
 
+from utils.supabase_query import execute
+from utils.supabase_clients import get_admin_client
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -36,7 +39,7 @@ class ThoughtPromptsService:
                 "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment variables"
             )
         
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+        self.supabase: Client = get_admin_client()
     
     # =========================================================================
     # Thought Prompts Methods
@@ -50,14 +53,13 @@ class ThoughtPromptsService:
             Dict with prompt data (id, question, created_at) or None if no prompts exist
         """
         try:
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompts')
                 .select('id, question, created_at')
                 .eq('is_active', True)
                 .order('created_at', desc=True)
                 .limit(1)
-                .execute()
             )
             
             if result.data and len(result.data) > 0:
@@ -80,12 +82,11 @@ class ThoughtPromptsService:
         """
         try:
             # First, get all active prompts
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompts')
                 .select('id, question, created_at')
                 .eq('is_active', True)
-                .execute()
             )
             
             if result.data and len(result.data) > 0:
@@ -112,12 +113,11 @@ class ThoughtPromptsService:
             Dict with prompt data or None if not found
         """
         try:
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompts')
                 .select('id, question, is_active, created_at')
                 .eq('id', prompt_id)
-                .execute()
             )
             
             if result.data and len(result.data) > 0:
@@ -137,13 +137,12 @@ class ThoughtPromptsService:
             List of prompt dicts
         """
         try:
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompts')
                 .select('id, question, created_at')
                 .eq('is_active', True)
                 .order('created_at', desc=True)
-                .execute()
             )
             
             return result.data if result.data else []
@@ -193,18 +192,17 @@ class ThoughtPromptsService:
             now_iso = datetime.utcnow().isoformat()
             
             # Check if user already has a response for this prompt
-            existing = (
+            existing = await execute(
                 self.supabase
                 .table('thought_prompt_responses')
                 .select('id')
                 .eq('user_id', user_id)
                 .eq('thought_prompt_id', thought_prompt_id)
-                .execute()
             )
             
             if existing.data and len(existing.data) > 0:
                 # Update existing response
-                result = (
+                result = await execute(
                     self.supabase
                     .table('thought_prompt_responses')
                     .update({
@@ -212,12 +210,11 @@ class ThoughtPromptsService:
                         'updated_at': now_iso
                     })
                     .eq('id', existing.data[0]['id'])
-                    .execute()
                 )
                 logger.info(f"Updated response for user {user_id} on prompt {thought_prompt_id}")
             else:
                 # Insert new response
-                result = (
+                result = await execute(
                     self.supabase
                     .table('thought_prompt_responses')
                     .insert({
@@ -227,7 +224,6 @@ class ThoughtPromptsService:
                         'created_at': now_iso,
                         'updated_at': now_iso
                     })
-                    .execute()
                 )
                 logger.info(f"Created new response for user {user_id} on prompt {thought_prompt_id}")
             
@@ -259,13 +255,12 @@ class ThoughtPromptsService:
             Dict with response data or None if no response exists
         """
         try:
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompt_responses')
                 .select('*')
                 .eq('user_id', user_id)
                 .eq('thought_prompt_id', thought_prompt_id)
-                .execute()
             )
             
             if result.data and len(result.data) > 0:
@@ -298,14 +293,13 @@ class ThoughtPromptsService:
         """
         try:
             # Get responses with prompt data via join
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompt_responses')
                 .select('*, thought_prompts(question)')
                 .eq('user_id', user_id)
                 .order('created_at', desc=True)
                 .range(offset, offset + limit - 1)
-                .execute()
             )
             
             # Flatten the nested prompt data
@@ -340,12 +334,11 @@ class ThoughtPromptsService:
             Integer count of responses
         """
         try:
-            result = (
+            result = await execute(
                 self.supabase
                 .table('thought_prompt_responses')
                 .select('id', count='exact')
                 .eq('user_id', user_id)
-                .execute()
             )
             
             count = result.count if hasattr(result, 'count') and result.count is not None else 0
@@ -0,0 +1,29 @@
+import os
+from typing import Optional
+
+import anthropic
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# One Anthropic client for the whole app (post generation, news summaries and
+# news hooks), so every LLM call shares a single keep-alive connection pool.
+# Explicit pool limits so fanned-out generations don't exhaust it.
+#
+# 429s and overloaded errors are retried by the SDK with exponential backoff,
+# honouring the Retry-After header. LLM_MAX_RETRIES overrides the retry count
+# (the SDK default is 2).
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+
+anthropic_client: Optional[anthropic.AsyncAnthropic] = None
+if os.getenv("ANTHROPIC_API_KEY"):
+    anthropic_client = anthropic.AsyncAnthropic(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        max_retries=LLM_MAX_RETRIES,
+        http_client=anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=30, keepalive_expiry=30),
+        ),
+    )
+else:
+    print("Warning: ANTHROPIC_API_KEY is not set; LLM generation endpoints will return 503")
@@ -0,0 +1,14 @@
+import httpx
+
+# Long-lived client for LinkedIn API calls. Reusing it across requests keeps
+# connections (and their TLS sessions) alive instead of re-establishing them
+# for every call.
+linkedin_http_client = httpx.AsyncClient()
+
+# Shared client for the industry news providers, reused across fetches for the
+# same reason. HTTP/2 is negotiated per host (falling back to HTTP/1.1), so
+# concurrent fetches to one provider can share a single connection.
+news_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=30, keepalive_expiry=30),
+)
@@ -1,6 +1,5 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+import time
+from typing import Dict, List, Union
 
 from fastapi import Request, HTTPException, status
 
@@ -8,20 +7,35 @@ from fastapi import Request, HTTPException, status
 class RateLimiter:
     """In-memory rate limiter that tracks requests per IP address."""
 
-    def __init__(self, max_requests: int = 10, window_seconds: int = 3600):
+    def __init__(
+        self, max_requests: int = 10, window_seconds: int = 3600, max_tracked_ips: int = 50_000
+    ):
         """
         Initialize rate limiter.
 
         Args:
             max_requests: Maximum number of requests allowed in the time window
             window_seconds: Time window in seconds (default: 3600 = 1 hour)
+            max_tracked_ips: Most IPs tracked at once; the oldest window is
+                dropped beyond this
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        # IP -> (count, reset_time)
-        self._store: Dict[str, Tuple[int, datetime]] = defaultdict(
-            lambda: (0, datetime.now())
-        )
+        self.max_tracked_ips = max_tracked_ips
+        # IP -> [count, reset_time on the monotonic clock], mutated in place.
+        # Windows are (re)inserted when they start and all have the same
+        # length, so insertion order is also expiry order.
+        self._store: Dict[str, List[Union[int, float]]] = {}
+
+    def _start_window(self, ip: str, now: float) -> None:
+        self._store.pop(ip, None)
+        # Drop expired windows from the front, plus the oldest live one if full
+        while self._store:
+            oldest_ip = next(iter(self._store))
+            if self._store[oldest_ip][1] > now and len(self._store) < self.max_tracked_ips:
+                break
+            del self._store[oldest_ip]
+        self._store[ip] = [1, now + self.window_seconds]
 
     def check_rate_limit(self, ip: str) -> bool:
         """
@@ -33,31 +47,30 @@ class RateLimiter:
         Returns:
             True if allowed, False if rate limited
         """
-        now = datetime.now()
-        count, reset_time = self._store[ip]
+        now = time.monotonic()
+        entry = self._store.get(ip)
 
-        # Reset if window has passed
-        if now >= reset_time:
-            self._store[ip] = (1, now + timedelta(seconds=self.window_seconds))
+        # Start a new window if there is none or it has passed
+        if entry is None or now >= entry[1]:
+            self._start_window(ip, now)
             return True
 
         # Check if limit exceeded
-        if count >= self.max_requests:
+        if entry[0] >= self.max_requests:
             return False
 
         # Increment count
-        self._store[ip] = (count + 1, reset_time)
+        entry[0] += 1
         return True
 
     def get_remaining_requests(self, ip: str) -> int:
         """Get remaining requests for an IP in the current window."""
-        count, reset_time = self._store[ip]
-        now = datetime.now()
+        entry = self._store.get(ip)
 
-        if now >= reset_time:
+        if entry is None or time.monotonic() >= entry[1]:
             return self.max_requests
 
-        return max(0, self.max_requests - count)
+        return max(0, self.max_requests - entry[0])
 
 
 def get_client_ip(request: Request) -> str:
@@ -0,0 +1,31 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def get_anon_client() -> Client:
+    """
+    Public client (anon key): good for auth flows and reads with RLS.
+    Built once and shared, so every caller reuses one connection pool.
+    """
+    return create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_ANON_KEY"])
+
+
+@lru_cache(maxsize=None)
+def get_admin_client() -> Optional[Client]:
+    """
+    Admin client (service role): bypasses RLS for trusted server-side writes.
+    Built once and shared across routers and services. None when
+    SUPABASE_SERVICE_ROLE_KEY is not set.
+    """
+    url = os.getenv("SUPABASE_URL")
+    service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not service_role_key:
+        return None
+    return create_client(url, service_role_key)
@@ -0,0 +1,13 @@
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+
+async def execute(query: Any) -> Any:
+    """
+    Run a supabase-py query builder's blocking execute() in the threadpool.
+
+    The supabase client is synchronous, so calling execute() directly inside
+    an async handler would stall the event loop for the whole round-trip.
+    """
+    return await run_in_threadpool(query.execute)